@@ -0,0 +1,74 @@
+"""
+startup.py
+Startup time of the CLI vs importing every heavy dependency up front (what
+running one of the old stage scripts cost before doing any work).
+
+    python benchmarks/startup.py [--runs 5]
+
+Each command runs in a fresh interpreter; the best of N runs is reported.
+Also checks that `--help` does not load any heavy module.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("cv2", "mediapipe", "pandas", "tkinter", "PIL", "numpy")
+
+COMMANDS = {
+    "eager imports (old scripts)": ["-c", "import cv2, numpy, mediapipe, pandas, tkinter, PIL.ImageTk"],
+    "occluded-motion --help": ["-m", "occluded_motion", "--help"],
+    "occluded-motion replay --help": ["-m", "occluded_motion", "replay", "--help"],
+    "import occluded_motion.replay": ["-c", "import occluded_motion.replay"],
+}
+
+
+def best_time(args, runs):
+    best = float("inf")
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        proc = subprocess.run([sys.executable, *args], cwd=ROOT,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        elapsed = time.perf_counter() - t0
+        if proc.returncode != 0:
+            return None, proc.stderr.decode().strip().splitlines()[-1]
+        best = min(best, elapsed)
+    return best, None
+
+
+def heavy_modules_loaded(argv):
+    """Heavy top-level modules in sys.modules after parsing argv with the CLI."""
+    code = ("import contextlib, io, sys\n"
+            "from occluded_motion.cli import main\n"
+            "with contextlib.redirect_stdout(io.StringIO()):\n"
+            "    try:\n"
+            f"        main({argv!r})\n"
+            "    except SystemExit:\n"
+            "        pass\n"
+            f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    return [m for m in out.stdout.strip().split(",") if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'command':32s} {'best (ms)':>10s}")
+    for name, cmd in COMMANDS.items():
+        seconds, error = best_time(cmd, args.runs)
+        result = f"{seconds * 1000:10.1f}" if seconds is not None else f"  failed: {error}"
+        print(f"{name:32s} {result}")
+
+    for argv in (["--help"], ["replay", "--help"], ["pose", "--help"]):
+        loaded = heavy_modules_loaded(argv)
+        status = "ok" if not loaded else "loaded " + ", ".join(loaded)
+        print(f"heavy imports for {' '.join(argv):14s} {status}")
+
+
+if __name__ == "__main__":
+    main()
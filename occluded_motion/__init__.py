@@ -0,0 +1,11 @@
+"""
+occluded_motion
+Occluded person reconstruction: median background, CSRT + optical flow
+tracking, MediaPipe pose estimation/interpolation and rendering.
+
+Importing the package is cheap: submodules (and OpenCV, MediaPipe, Tkinter)
+are only loaded when used, e.g. `from occluded_motion.tracking import track_video`.
+Command line: `occluded-motion --help` or `python -m occluded_motion --help`.
+"""
+
+__version__ = "0.2.0"
@@ -0,0 +1,73 @@
+"""
+annotations.py
+Per-frame annotation stream: bboxes, keypoints and occluded flags. Written by
+the pose stage in annotation-only mode and consumed by render.py, which draws
+it onto the source video lazily.
+
+One CSV row per annotated frame:
+  frame_idx, x, y, w, h, occluded, pose_predicted, keypoints
+where keypoints is "x0 y0 x1 y1 ..." in original frame coordinates (empty if
+the frame has a bbox but no pose). occluded marks frames inside the occlusion,
+pose_predicted marks poses filled by interpolation instead of MediaPipe.
+"""
+
+import csv
+
+import numpy as np
+
+FIELDS = ["frame_idx", "x", "y", "w", "h", "occluded", "pose_predicted", "keypoints"]
+
+
+def make_annotations(predicted_bboxes, predicted_poses, inferred_frames=(), occluded_frames=()):
+    """Build the in-memory annotation stream (same shape as load_annotations returns).
+    inferred_frames: frames whose pose came from MediaPipe (others are predicted).
+    Every occluded frame gets an entry, even without a bbox or pose, so it is inpainted."""
+    inferred_frames = set(inferred_frames)
+    occluded_frames = set(occluded_frames)
+    annotations = {}
+    for idx in sorted(set(predicted_bboxes) | set(predicted_poses) | occluded_frames):
+        bbox = predicted_bboxes.get(idx)
+        keypoints = predicted_poses.get(idx)
+        annotations[idx] = {
+            "bbox": tuple(float(v) for v in bbox) if bbox is not None else None,
+            "keypoints": np.asarray(keypoints) if keypoints is not None else None,
+            "occluded": idx in occluded_frames,
+            "pose_predicted": keypoints is not None and idx not in inferred_frames,
+        }
+    return annotations
+
+
+def write_annotations(path, annotations):
+    """Write the per-frame annotation stream to CSV. Returns the number of rows."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        for idx in sorted(annotations):
+            ann = annotations[idx]
+            bbox = ann["bbox"]
+            x, y, w, h = (round(v, 2) for v in bbox) if bbox is not None else ("", "", "", "")
+            keypoints = ann["keypoints"]
+            kp = "" if keypoints is None else " ".join(f"{v:.2f}" for v in keypoints.ravel())
+            writer.writerow([idx, x, y, w, h, int(ann["occluded"]), int(ann["pose_predicted"]), kp])
+    return len(annotations)
+
+
+def load_annotations(path):
+    """Return {frame_idx: {"bbox": (x, y, w, h) or None, "keypoints": ndarray or None,
+    "occluded": bool, "pose_predicted": bool}}."""
+    annotations = {}
+    with open(path, "r") as f:
+        for row in csv.DictReader(f):
+            bbox = None
+            if row["x"] != "":
+                bbox = tuple(float(row[k]) for k in ("x", "y", "w", "h"))
+            keypoints = None
+            if row["keypoints"]:
+                keypoints = np.array(row["keypoints"].split(), dtype=float).reshape(-1, 2)
+            annotations[int(row["frame_idx"])] = {
+                "bbox": bbox,
+                "keypoints": keypoints,
+                "occluded": row["occluded"] == "1",
+                "pose_predicted": row["pose_predicted"] == "1",
+            }
+    return annotations
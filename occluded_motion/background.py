@@ -0,0 +1,52 @@
+"""
+background.py
+Stage 1: clean background image by median blending of the frames in which
+the occluder (the bus) is not visible.
+"""
+
+import os
+
+import cv2
+import numpy as np
+
+from .video import video_info
+
+
+def extract_frames(video_path, frames_dir):
+    """Save every frame as frames_dir/frame_XXXX.jpg. Returns the number of frames."""
+    os.makedirs(frames_dir, exist_ok=True)
+    cap = cv2.VideoCapture(video_path)
+    count = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        cv2.imwrite(os.path.join(frames_dir, f"frame_{count:04d}.jpg"), frame)
+        count += 1
+    cap.release()
+    return count
+
+
+def build_background(video_path, occ_start, occ_end, max_samples=None):
+    """Median background from frames outside [occ_start, occ_end].
+    With max_samples, at most that many evenly spaced frames are decoded into memory."""
+    total = video_info(video_path)["frame_count"]
+    candidates = [i for i in range(total) if not occ_start <= i <= occ_end]
+    if not candidates:
+        raise ValueError("No frames outside the occlusion range to build a background from")
+    if max_samples:
+        step = max(1, len(candidates) // max_samples)
+        candidates = candidates[::step][:max_samples]
+    wanted = set(candidates)
+
+    cap = cv2.VideoCapture(video_path)
+    samples = []
+    for idx in range(total):
+        if not cap.grab():
+            break
+        if idx in wanted:
+            ret, frame = cap.retrieve()
+            if ret:
+                samples.append(frame)
+    cap.release()
+    return np.median(samples, axis=0).astype(np.uint8)
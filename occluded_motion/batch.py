@@ -0,0 +1,305 @@
+"""
+batch.py
+Run background, headless tracking, pose and render for many videos on a
+process pool.
+
+Input is either a directory of videos, each with a sidecar <video>.json holding
+its tracking config, or a manifest (.json list / .csv) with one entry per video:
+
+  {"video": "clip01.mp4",
+   "before_frame": 1, "bbox_before": [421, 162, 43, 131],
+   "after_frame": 75, "bbox_after": [380, 150, 45, 135],
+   "bus_enter_frame": 40, "bus_occlude_frame": 47, "mc_leave_frame": 150,
+   "occlusion_start": 48, "occlusion_end": 73,        # optional, default: the tracking gap
+   "id": "site1/clip01"}                              # optional, default: path without extension
+
+The occluded frames (inpainted, and left out of the background median) default
+to the bbox gap the tracker leaves between the optical-flow and CSRT-post rows.
+
+Each video's id is its path relative to the directory or manifest (without
+extension), unless the entry sets "id". Outputs go to <out>/<id>/ and progress
+is keyed by id, so a/clip.mp4 and b/clip.mp4 do not collide.
+
+Each worker builds one MediaPipe Pose at startup and reuses it for every video
+it processes. With --annotations-only, only the annotation stream is written
+(no video re-encode). Finished videos are appended to <out>/progress.jsonl, so a rerun
+skips them. A per-video timing report is written to <out>/batch_summary.json.
+
+Usage:
+  occluded-motion batch videos/ --out batch_out --workers 8 --max-memory-mb 2048
+"""
+
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+
+import cv2
+
+from .annotations import write_annotations
+from .background import build_background
+from .pose import create_pose, reconstruct
+from .render import render_video
+from .tracking import TRACKING_CONFIG_KEYS, occlusion_gap, save_tracking_csv, track_video
+from .video import video_info
+
+VIDEO_EXTS = (".mp4", ".avi", ".mkv", ".mov")
+PROGRESS_FILE = "progress.jsonl"
+SUMMARY_FILE = "batch_summary.json"
+
+# Per-worker state, created once by _init_worker
+_pose = None
+_worker_opts = None
+
+
+# -------------------- Job discovery --------------------
+def load_jobs(source):
+    """Return a list of job dicts (tracking config + absolute 'video' path + unique 'id')."""
+    jobs = _load_entries(source)
+    base = source if os.path.isdir(source) else os.path.dirname(os.path.abspath(source))
+    seen = {}
+    for job in jobs:
+        job.setdefault("id", _default_id(job["video"], base))
+        job["id"] = str(job["id"])
+        if job["id"] in seen:
+            raise ValueError(f"Duplicate batch id {job['id']!r}: {seen[job['id']]} and {job['video']}")
+        seen[job["id"]] = job["video"]
+    return jobs
+
+
+def _load_entries(source):
+    if os.path.isdir(source):
+        jobs = []
+        for name in sorted(os.listdir(source)):
+            if not name.lower().endswith(VIDEO_EXTS):
+                continue
+            video = os.path.join(source, name)
+            sidecar = os.path.splitext(video)[0] + ".json"
+            job = {"video": video}
+            if os.path.exists(sidecar):
+                with open(sidecar) as f:
+                    job.update(json.load(f))
+                job["video"] = video
+            jobs.append(job)
+        return jobs
+
+    base = os.path.dirname(os.path.abspath(source))
+    if source.lower().endswith(".csv"):
+        with open(source, newline="") as f:
+            entries = [_parse_csv_entry(row) for row in csv.DictReader(f)]
+    else:
+        with open(source) as f:
+            entries = json.load(f)
+    for job in entries:
+        if not os.path.isabs(job["video"]):
+            job["video"] = os.path.join(base, job["video"])
+    return entries
+
+
+def _parse_csv_entry(row):
+    """CSV manifests store bboxes as 'x y w h'."""
+    job = {}
+    for key, value in row.items():
+        if value is None or value == "":
+            continue
+        if key.startswith("bbox_"):
+            job[key] = [int(v) for v in value.split()]
+        elif key in ("video", "id"):
+            job[key] = value
+        else:
+            job[key] = int(value)
+    return job
+
+
+def _default_id(video, base):
+    """Video path relative to base, without extension, with '/' separators."""
+    rel = os.path.relpath(os.path.abspath(video), os.path.abspath(base))
+    if rel.startswith(os.pardir):
+        rel = os.path.abspath(video).lstrip(os.sep)  # outside base: use the full path
+    return os.path.splitext(rel)[0].replace(os.sep, "/")
+
+
+def job_id(job):
+    return job["id"]
+
+
+def job_dir(out_dir, vid):
+    return os.path.join(out_dir, *vid.split("/"))
+
+
+def load_progress(out_dir):
+    """ids of videos that already finished successfully."""
+    path = os.path.join(out_dir, PROGRESS_FILE)
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # partial line from an interrupted run
+            if record.get("status") == "ok":
+                done[record["id"]] = record
+    return done
+
+
+# -------------------- Worker side --------------------
+def _init_worker(max_memory_mb, opts):
+    global _pose, _worker_opts
+    if max_memory_mb:
+        try:
+            import resource
+            limit = int(max_memory_mb) * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError) as e:
+            print(f"[worker {os.getpid()}] memory cap not applied: {e}")
+    cv2.setNumThreads(1)  # parallelism comes from the pool, not from OpenCV
+
+    _pose = create_pose()  # one MediaPipe instance per worker, reused across videos
+    _worker_opts = opts
+
+
+def process_video(job):
+    """Full pipeline for one video. Runs inside a worker process."""
+
+    vid = job_id(job)
+    name = os.path.splitext(os.path.basename(job["video"]))[0]
+    out_dir = job_dir(_worker_opts["out_dir"], vid)
+    os.makedirs(out_dir, exist_ok=True)
+    record = {"id": vid, "video": job["video"], "worker": os.getpid(), "timings": {}}
+    timings = record["timings"]
+    t_start = time.perf_counter()
+
+    try:
+        info = video_info(job["video"])
+        record["frames"] = info["frame_count"]
+
+        t = time.perf_counter()
+        tracking_data = track_video(job["video"], job)
+        save_tracking_csv(tracking_data, os.path.join(out_dir, f"tracker_{name}.csv"))
+        bbox_dict = {row[0]: tuple(row[1:5]) for row in tracking_data}
+        timings["tracking"] = time.perf_counter() - t
+
+        # The person is hidden where the tracker has no bbox, not while flow still follows them
+        gap = occlusion_gap(bbox_dict)
+        occ_start = int(job.get("occlusion_start", gap[0] if gap else 0))
+        occ_end = int(job.get("occlusion_end", gap[-1] if gap else -1))
+
+        t = time.perf_counter()
+        background = build_background(job["video"], occ_start, occ_end, max_samples=60)
+        cv2.imwrite(os.path.join(out_dir, "background.jpg"), background)
+        timings["background"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        annotations, selector = reconstruct(job["video"], bbox_dict, _pose,
+                                            sparse=_worker_opts["sparse"],
+                                            quality=_worker_opts["quality"],
+                                            occluded_frames=range(occ_start, occ_end + 1))
+        timings["pose"] = time.perf_counter() - t
+        if selector is not None:
+            record["pose_skipped_fraction"] = selector.skipped_fraction
+
+        t = time.perf_counter()
+        if _worker_opts["annotations_only"]:
+            output_path = os.path.join(out_dir, f"{name}_pose_annotations.csv")
+            write_annotations(output_path, annotations)
+        else:
+            output_path = os.path.join(out_dir, f"{name}_pose_reconstructed_inpainted.mp4")
+            render_video(job["video"], annotations, output_path, background=background,
+                         passthrough=_worker_opts["passthrough"])
+        timings["render"] = time.perf_counter() - t
+
+        record["output"] = output_path
+        record["status"] = "ok"
+    except MemoryError:
+        record["status"] = "failed"
+        record["error"] = "MemoryError (per-worker memory cap exceeded)"
+    except Exception as e:
+        record["status"] = "failed"
+        record["error"] = f"{type(e).__name__}: {e}"
+
+    timings["total"] = time.perf_counter() - t_start
+    return record
+
+
+# -------------------- Driver --------------------
+def run_batch(source, out_dir, workers=None, max_memory_mb=None, sparse=False, quality=0.7,
+              resume=True, annotations_only=False, passthrough=True):
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = load_jobs(source)
+    done = load_progress(out_dir) if resume else {}
+    if not resume and os.path.exists(os.path.join(out_dir, PROGRESS_FILE)):
+        os.remove(os.path.join(out_dir, PROGRESS_FILE))
+
+    pending, records = [], []
+    resumed = [done[job_id(job)] for job in jobs if job_id(job) in done]
+    for job in jobs:
+        if job_id(job) in done:
+            continue
+        if not all(k in job for k in TRACKING_CONFIG_KEYS):
+            records.append({"id": job_id(job), "video": job.get("video"), "status": "failed",
+                            "error": "missing tracking config", "timings": {}})
+            continue
+        pending.append(job)
+
+    workers = workers or os.cpu_count() or 1
+    print(f"{len(jobs)} videos, {len(done)} already done, {len(pending)} to process on {workers} workers")
+
+    opts = {"out_dir": out_dir, "sparse": sparse, "quality": quality,
+            "annotations_only": annotations_only, "passthrough": passthrough}
+    t_start = time.perf_counter()
+    progress_path = os.path.join(out_dir, PROGRESS_FILE)
+    # spawn: MediaPipe/TFLite threads do not survive fork()
+    ctx = multiprocessing.get_context("spawn")
+    with open(progress_path, "a") as progress, \
+            ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                initializer=_init_worker, initargs=(max_memory_mb, opts)) as pool:
+        futures = {pool.submit(process_video, job): job for job in pending}
+        for n, future in enumerate(as_completed(futures), 1):
+            job = futures[future]
+            try:
+                record = future.result()
+            except Exception as e:  # worker died (e.g. killed for memory)
+                record = {"id": job_id(job), "video": job["video"], "status": "failed",
+                          "error": f"{type(e).__name__}: {e}", "timings": {}}
+            records.append(record)
+            progress.write(json.dumps(record) + "\n")
+            progress.flush()
+            print(f"[{n}/{len(pending)}] {record['id']}: {record['status']} "
+                  f"({record['timings'].get('total', 0):.1f}s)")
+
+    wall = time.perf_counter() - t_start
+    summary = build_summary(records, wall, workers, resumed)
+    with open(os.path.join(out_dir, SUMMARY_FILE), "w") as f:
+        json.dump(summary, f, indent=2)
+    print(f"Done: {summary['ok']} ok, {summary['failed']} failed, {summary['resumed']} resumed in {wall:.1f}s "
+          f"({summary['videos_per_second']:.2f} videos/s). Report: {os.path.join(out_dir, SUMMARY_FILE)}")
+    return summary
+
+
+def build_summary(records, wall_seconds, workers, resumed=()):
+    """records: videos processed in this run; resumed: ok records from earlier runs.
+    Throughput and stage timings only cover this run, since wall_seconds does."""
+    ok = [r for r in records if r.get("status") == "ok"]
+    stage_totals = {}
+    for r in ok:
+        for stage, secs in r["timings"].items():
+            stage_totals[stage] = stage_totals.get(stage, 0.0) + secs
+    return {
+        "workers": workers,
+        "wall_seconds": wall_seconds,
+        "ok": len(ok),
+        "failed": len(records) - len(ok),
+        "videos_per_second": len(ok) / wall_seconds if wall_seconds > 0 else 0.0,
+        "frames_processed": sum(r.get("frames", 0) for r in ok),
+        "stage_seconds": stage_totals,
+        "videos": sorted(records, key=lambda r: r["id"]),
+        "resumed": len(resumed),
+        "resumed_videos": sorted(resumed, key=lambda r: r["id"]),
+    }
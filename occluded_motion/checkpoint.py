@@ -0,0 +1,60 @@
+"""
+checkpoint.py
+Checkpoints for tracking sessions, so a session can resume at a given frame
+instead of replaying the video from frame 0.
+
+A checkpoint is the tracking state *after* frame_idx was processed:
+frame indices / phase boundaries, current bboxes, optical-flow points, the
+collected tracking_data and which trackers were active. CSRT trackers cannot
+be serialized; on resume they are re-initialized on frame frame_idx from the
+stored bboxes, and the optical-flow reference image is re-read from that frame.
+"""
+
+import json
+import os
+
+import numpy as np
+
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_dir(video_path, root="checkpoints"):
+    base = os.path.splitext(os.path.basename(video_path))[0]
+    return os.path.join(root, base)
+
+
+def save_checkpoint(directory, state):
+    """Write state to <directory>/frame_<idx>_<reason>.json and return the path."""
+    os.makedirs(directory, exist_ok=True)
+    state = dict(state, version=CHECKPOINT_VERSION)
+    if state.get("prev_points") is not None:
+        state["prev_points"] = np.asarray(state["prev_points"], dtype=float).reshape(-1, 2).tolist()
+    state["tracking_data"] = [list(row) for row in state.get("tracking_data", [])]
+    path = os.path.join(directory, f"frame_{state['frame_idx']:05d}_{state.get('reason', 'manual')}.json")
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, default=_to_builtin)
+    os.replace(tmp, path)  # never leave a half-written checkpoint behind
+    return path
+
+
+def load_checkpoint(path):
+    with open(path, "r") as f:
+        state = json.load(f)
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version in {path}")
+    if state.get("prev_points") is not None:
+        state["prev_points"] = np.array(state["prev_points"], dtype=np.float32).reshape(-1, 1, 2)
+    for key in ("bbox_before", "bbox_after", "post_bbox"):
+        if state.get(key) is not None:
+            state[key] = tuple(int(v) for v in state[key])
+    state["tracking_data"] = [tuple(row) for row in state["tracking_data"]]
+    return state
+
+
+def _to_builtin(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
@@ -0,0 +1,221 @@
+"""
+cli.py
+Command-line entry point: `occluded-motion <command>` or `python -m occluded_motion <command>`.
+
+Only argparse and the standard library are imported here. Each command
+imports its own module when it runs, so `--help` and light commands such as
+`replay` never load mediapipe, tkinter or PIL.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+
+def _base(video_path):
+    return os.path.splitext(os.path.basename(video_path))[0]
+
+
+# -------------------- Commands --------------------
+def cmd_background(args):
+    from .background import build_background, extract_frames
+    from .video import video_info
+
+    info = video_info(args.video)
+    print("Video Info:")
+    print(f"  FPS: {info['fps']:.0f} | Resolution: {info['width']}x{info['height']}")
+    print(f"  Total Frames: {info['frame_count']} (~{info['frame_count'] / info['fps']:.1f} seconds)")
+
+    if args.frames_dir:
+        count = extract_frames(args.video, args.frames_dir)
+        print(f"✓ Extracted {count} frames to '{args.frames_dir}/'")
+
+    if args.occlusion:
+        bus_start, bus_end = args.occlusion
+    else:
+        print("\nPlease specify when the bus appears and disappears in the video.")
+        bus_start = int(input("Enter bus appearance start frame number: "))
+        bus_end = int(input("Enter bus disappearance end frame number: "))
+
+    background = build_background(args.video, bus_start, bus_end, max_samples=args.max_samples)
+    import cv2
+    cv2.imwrite(args.out, background)
+    print(f"✓ Background image saved as '{args.out}'")
+
+
+def cmd_gui(args):
+    from . import gui
+    gui.main()
+
+
+def cmd_track(args):
+    from .tracking import save_tracking_csv, track_video
+
+    with open(args.config) as f:
+        cfg = json.load(f)
+    rows = track_video(args.video, cfg, concurrent=not args.sequential,
+                       bidirectional=not args.forward_only)
+    out = args.out or f"tracker_{_base(args.video)}.csv"
+    save_tracking_csv(rows, out)
+    print(f"Saved {len(rows)} tracked frames to {out}")
+
+
+def cmd_replay(args):
+    from .replay import replay
+
+    print("Replay:", replay(args.video, args.csv))
+
+
+def cmd_pose(args):
+    from .annotations import write_annotations
+    from .pose import create_pose, reconstruct
+    from .tracking import load_tracking_csv, occlusion_gap
+
+    bbox_dict, _ = load_tracking_csv(args.csv)
+    if args.occlusion:
+        occluded = range(args.occlusion[0], args.occlusion[1] + 1)
+    else:
+        # The person is hidden where the tracker has no bbox (optical flow still sees them)
+        occluded = occlusion_gap(bbox_dict)
+
+    print("Extracting poses from visible frames...")
+    pose = create_pose()
+    try:
+        # Stage 3 draws tracked bboxes only; stage 4 (--background) also interpolated ones
+        interpolate_bboxes = args.interpolate_bboxes or args.background is not None
+        annotations, selector = reconstruct(args.video, bbox_dict, pose, sparse=args.sparse,
+                                            quality=args.quality, occluded_frames=occluded,
+                                            interpolate_bboxes=interpolate_bboxes)
+    finally:
+        pose.close()
+    if selector is not None:
+        print(selector.summary())
+
+    if args.annotations_only:
+        out = args.out or f"{_base(args.video)}_pose_annotations.csv"
+        n = write_annotations(out, annotations)
+        print(f"Saved {n} annotated frames to {out} (render with `occluded-motion render`)")
+        return
+    _render(args.video, annotations, args.out, args.background, None, not args.no_passthrough)
+
+
+def cmd_render(args):
+    from .annotations import load_annotations
+
+    _render(args.video, load_annotations(args.annotations), args.out, args.background,
+            args.frame, not args.no_passthrough)
+
+
+def _render(video_path, annotations, out, background_path, frame, passthrough):
+    import cv2
+    from .render import load_background, render_frame, render_video
+    from .video import video_info
+
+    info = video_info(video_path)
+    background = load_background(background_path, info["width"], info["height"])
+    if frame is not None:
+        out = out or f"{_base(video_path)}_frame_{frame}.jpg"
+        cv2.imwrite(out, render_frame(video_path, annotations, frame, background))
+        print(f"Saved frame {frame} to {out}")
+        return
+    suffix = "_inpainted" if background is not None else ""
+    out = out or f"{_base(video_path)}_pose_reconstructed{suffix}.mp4"
+    print("Rendering final video...")
+    stats = render_video(video_path, annotations, out, background, passthrough=passthrough)
+    print(f"Saved {out} ({stats['encoded_frames']} frames encoded, "
+          f"{stats['copied_frames']} passed through)")
+
+
+def cmd_batch(args):
+    from .batch import run_batch
+
+    run_batch(args.source, args.out, workers=args.workers, max_memory_mb=args.max_memory_mb,
+              sparse=args.sparse, quality=args.quality, resume=not args.no_resume,
+              annotations_only=args.annotations_only, passthrough=not args.no_passthrough)
+
+
+# -------------------- Parser --------------------
+def _add_pose_options(parser):
+    parser.add_argument("--sparse", action="store_true",
+                        help="run pose only on keyframes and interpolate the rest (default: every frame)")
+    parser.add_argument("--quality", type=float, default=0.7,
+                        help="--sparse quality in [0, 1]; 1.0 infers every frame (default 0.7)")
+    parser.add_argument("--annotations-only", action="store_true",
+                        help="write bbox/keypoint annotations instead of rendering video")
+    parser.add_argument("--no-passthrough", action="store_true",
+                        help="re-encode every frame instead of stream-copying overlay-free segments")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="occluded-motion",
+        description="Occluded person reconstruction: background, tracking, pose estimation and rendering.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("background", help="build a median background image (stage 1)")
+    p.add_argument("video")
+    p.add_argument("--occlusion", type=int, nargs=2, metavar=("START", "END"),
+                   help="frames where the occluder is visible (prompted if omitted)")
+    p.add_argument("--frames-dir", default=None, help="also extract every frame into this folder")
+    p.add_argument("--max-samples", type=int, default=None, help="median over at most N frames")
+    p.add_argument("--out", default="background.jpg")
+    p.set_defaults(func=cmd_background)
+
+    p = sub.add_parser("gui", help="interactive Tkinter tracker (stage 2)")
+    p.set_defaults(func=cmd_gui)
+
+    p = sub.add_parser("track", help="headless tracking from a JSON tracking config")
+    p.add_argument("video")
+    p.add_argument("config", help="JSON with before_frame, bbox_before, after_frame, bbox_after, "
+                                  "bus_enter_frame, bus_occlude_frame, mc_leave_frame")
+    p.add_argument("--out", default=None, help="tracker CSV (default tracker_<video>.csv)")
+    p.add_argument("--sequential", action="store_true", help="do not track segments concurrently")
+    p.add_argument("--forward-only", action="store_true", help="no backward optical flow")
+    p.set_defaults(func=cmd_track)
+
+    p = sub.add_parser("replay", help="replay a tracker CSV over its video (OpenCV window)")
+    p.add_argument("video")
+    p.add_argument("csv")
+    p.set_defaults(func=cmd_replay)
+
+    p = sub.add_parser("pose", help="pose estimation + interpolation from a tracker CSV (stages 3/4)")
+    p.add_argument("video")
+    p.add_argument("csv", help="tracker CSV")
+    p.add_argument("--out", default=None, help="output video, or annotations CSV with --annotations-only")
+    p.add_argument("--background", default=None, help="background image: replace occluded frames (stage 4)")
+    p.add_argument("--occlusion", type=int, nargs=2, metavar=("START", "END"),
+                   help="occluded frame range (default: the untracked gap in the CSV)")
+    p.add_argument("--interpolate-bboxes", action="store_true",
+                   help="also interpolate bboxes across gaps (always on with --background)")
+    _add_pose_options(p)
+    p.set_defaults(func=cmd_pose)
+
+    p = sub.add_parser("render", help="render annotations onto the source video, lazily")
+    p.add_argument("video")
+    p.add_argument("annotations", help="annotations CSV from --annotations-only")
+    p.add_argument("--out", default=None)
+    p.add_argument("--frame", type=int, default=None, help="render only this frame (image output)")
+    p.add_argument("--background", default=None, help="background image for occluded frames")
+    p.add_argument("--no-passthrough", action="store_true", help="re-encode every frame")
+    p.set_defaults(func=cmd_render)
+
+    p = sub.add_parser("batch", help="process a directory or manifest of videos on a process pool")
+    p.add_argument("source", help="directory of videos (+ <video>.json configs) or a .json/.csv manifest")
+    p.add_argument("--out", default="batch_out", help="output directory")
+    p.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    p.add_argument("--max-memory-mb", type=int, default=None, help="address-space cap per worker")
+    p.add_argument("--no-resume", action="store_true", help="ignore progress from earlier runs")
+    _add_pose_options(p)
+    p.set_defaults(func=cmd_batch)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(sys.argv[1:] if argv is None else argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,652 @@
+"""
+gui.py
+Tkinter GUI for semi-automatic tracking (stage 2): CSRT before/after the
+occlusion, optical flow during it. Displays the video at native size (1:1
+pixel mapping) so bounding box drawing aligns perfectly.
+
+Only imported by the `gui` subcommand, so tkinter and PIL are not loaded
+for anything else. The window is built by main(), not at import.
+"""
+
+import cv2
+import tkinter as tk
+from tkinter import filedialog, messagebox
+from PIL import Image, ImageTk
+import numpy as np
+import os
+
+from .checkpoint import checkpoint_dir, load_checkpoint, save_checkpoint
+from .playback import PlaybackScheduler
+from .replay import draw_box, load_frame_boxes
+from .tracking import save_tracking_csv as write_tracking_csv
+
+# -------------------- Globals --------------------
+cap = None
+video_path = None
+total_frames = 0
+orig_W = orig_H = None
+
+before_frame = None
+after_frame = None
+frames_set = False
+
+root = None
+panel = None
+status_label = None
+frame_label = None
+entry_before = entry_after = None
+
+current_frame_idx = 0
+current_frame_bgr = None
+current_display_img = None
+
+# drawing
+drawing = False
+sx = sy = ex = ey = 0
+
+# bounding boxes stored in original-video coords
+bbox_before = None
+bbox_after = None
+post_bbox = None  # latest CSRT-post box (for re-initializing from a checkpoint)
+
+# optical flow during the occlusion
+optical_flow_active = False
+prev_gray = None
+prev_points = None
+
+# trackers
+pre_tracker = None
+post_tracker = None
+pre_tracking_active = False
+post_tracking_active = False
+
+paused = False
+playing = False
+scheduler = None  # PlaybackScheduler driving live tracking or CSV replay
+
+tracking_data = []  # stores per-frame (idx, x, y, w, h, method)
+
+# checkpoints: saved at phase boundaries and every CHECKPOINT_INTERVAL tracked frames (0 = off)
+CHECKPOINT_INTERVAL = 25
+
+
+# -------------------- Helpers --------------------
+def reset_session():
+    """Forget the current tracking run: bboxes, trackers, optical flow and tracking_data."""
+    global bbox_before, bbox_after, post_bbox
+    global pre_tracker, post_tracker, pre_tracking_active, post_tracking_active
+    global optical_flow_active, prev_gray, prev_points
+
+    bbox_before = None
+    bbox_after = None
+    post_bbox = None
+
+    pre_tracker = None
+    post_tracker = None
+    pre_tracking_active = False
+    post_tracking_active = False
+
+    optical_flow_active = False
+    prev_gray = None
+    prev_points = None
+
+    tracking_data.clear()
+
+def reset_state(full=False):
+    global cap, video_path, total_frames, orig_W, orig_H
+    global before_frame, after_frame, frames_set
+    global current_frame_idx, current_frame_bgr, current_display_img
+    global paused, playing
+
+    stop_playback()
+    if cap and cap.isOpened():
+        cap.release()
+    cap = None
+    video_path = None
+    total_frames = 0
+    orig_W = orig_H = None
+
+    before_frame = None
+    after_frame = None
+    frames_set = False
+
+    current_frame_idx = 0
+    current_frame_bgr = None
+    current_display_img = None
+
+    reset_session()
+
+    paused = False
+    playing = False
+
+    status_label.config(text="Status: Idle")
+    frame_label.config(text="Frame: 0/0")
+    clear_canvas()
+
+def stop_playback():
+    global scheduler
+    if scheduler is not None:
+        scheduler.stop()
+        scheduler = None
+
+def video_fps():
+    return cap.get(cv2.CAP_PROP_FPS) or 24
+
+def clear_canvas():
+    global panel
+    if panel:
+        panel.config(image='')
+
+def open_video():
+    global cap, video_path, total_frames, orig_W, orig_H, panel
+
+    path = filedialog.askopenfilename(title="Select video file",
+                                      filetypes=[("Video files","*.mp4 *.avi *.mkv *.mov")])
+    if not path:
+        return
+    reset_state()
+    try:
+        cap_local = cv2.VideoCapture(path)
+        if not cap_local.isOpened():
+            messagebox.showerror("Error","Cannot open video")
+            return
+
+        w = int(cap_local.get(cv2.CAP_PROP_FRAME_WIDTH))
+        h = int(cap_local.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        total = int(cap_local.get(cv2.CAP_PROP_FRAME_COUNT))
+
+        # Commit globals
+        globals()['cap'] = cap_local
+        globals()['video_path'] = path
+        globals()['orig_W'] = w
+        globals()['orig_H'] = h
+        globals()['total_frames'] = total
+
+        # Resize window to video size dynamically
+        panel.place_configure(width=w, height=h)
+        root.geometry(f"{w + 260}x{h + 80}")
+
+        status_label.config(text=f"Loaded: {path} ({w}x{h}, {total} frames)")
+        frame_label.config(text=f"Frame: 0/{total}")
+
+    except Exception as e:
+        messagebox.showerror("Error", str(e))
+
+def set_frames():
+    global before_frame, after_frame, frames_set, current_frame_idx, paused, playing
+    if cap is None:
+        messagebox.showwarning("No video","Please select a video first")
+        return
+    try:
+        b = int(entry_before.get())
+        a = int(entry_after.get())
+    except:
+        messagebox.showwarning("Invalid","Enter integer frame indices")
+        return
+    if not (0 <= b < total_frames and 0 <= a < total_frames):
+        messagebox.showwarning("Out of range","Frame indices must be within video length")
+        return
+    if b >= a:
+        messagebox.showwarning("Invalid","before_frame must be less than after_frame")
+        return
+    before_frame = b
+    after_frame = a
+
+    global bus_enter_frame, bus_occlude_frame, mc_leave_frame
+    try:
+        bus_enter_frame = int(input("Enter one frame before bus enters the video: "))
+        bus_occlude_frame = int(input("Enter one frame before bus occludes: "))
+        mc_leave_frame = int(input("Enter one frame before the MC leaves the video: "))
+    except ValueError:
+        messagebox.showerror("Invalid input", "Enter valid integers for frame indices")
+        return
+    stop_playback()
+    reset_session()  # playback restarts at frame 0, so nothing from an earlier run carries over
+    frames_set = True
+    current_frame_idx = 0
+    paused = False
+    playing = True
+    status_label.config(text=f"Frames set: before={before_frame}, after={after_frame}. Playing...")
+    start_playback(process_frame, on_play_end)
+
+def start_playback(on_frame, on_end, start_frame=0):
+    """Run on_frame(idx, frame, late) through one shared, clock-driven scheduler."""
+    global scheduler
+    stop_playback()
+    scheduler = PlaybackScheduler(root, video_path, on_frame, fps=video_fps(),
+                                  start_frame=start_frame, on_end=on_end).start()
+
+def resume_playback():
+    if scheduler is not None:
+        scheduler.resume()
+
+def on_play_end(sched):
+    global playing
+    playing = False
+    status_label.config(text=f"Status: Video ended ({sched.report()})")
+    print("Playback:", sched.report())
+
+def process_frame(idx, frame, late):
+    """Tracking step for one frame. Late frames are still tracked, just not displayed."""
+    global current_frame_idx, current_frame_bgr, paused, playing
+    global pre_tracking_active, post_tracking_active
+    global pre_tracker, post_tracker
+    global optical_flow_active, prev_gray, prev_points, bbox_before, post_bbox
+
+    if cap is None or not frames_set or not playing or not root.winfo_exists():
+        stop_playback()
+        return
+
+    current_frame_bgr = frame.copy()
+    current_frame_idx = idx
+    frame_to_display = frame
+    tracked_before = len(tracking_data)
+    global bus_enter_frame, bus_occlude_frame, mc_leave_frame
+
+    # ------------- CSRT Pre-Tracker (before occlusion) -------------
+    if pre_tracking_active and pre_tracker is not None and current_frame_idx < bus_enter_frame:
+        ok, r = pre_tracker.update(frame_to_display)
+        if ok:
+            x, y, w, h = [int(v) for v in r]
+            cv2.rectangle(frame_to_display, (x, y), (x + w, y + h), (0, 255, 0), 2)
+            tracking_data.append((current_frame_idx, x, y, w, h, "CSRT-pre"))
+            bbox_before = (x, y, w, h)
+        else:
+            cv2.putText(frame_to_display, "Pre-tracker lost", (20, 40),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+
+    # ------------- Optical Flow (during occlusion 19–26) -------------
+
+    elif pre_tracking_active and bus_enter_frame <= current_frame_idx <= bus_occlude_frame:
+        gray = cv2.cvtColor(frame_to_display, cv2.COLOR_BGR2GRAY)
+
+        # Initialize points once at the start of occlusion
+        if not globals().get("optical_flow_active", False):
+            optical_flow_active = True
+            prev_gray = cv2.cvtColor(current_frame_bgr, cv2.COLOR_BGR2GRAY)
+            x, y, w, h = bbox_before
+            prev_points = cv2.goodFeaturesToTrack(prev_gray[y:y+h, x:x+w], maxCorners=50,
+                                                  qualityLevel=0.3, minDistance=5)
+            if prev_points is not None:
+                prev_points[:, 0, 0] += x
+                prev_points[:, 0, 1] += y
+
+        if prev_points is not None:
+            next_points, status, _ = cv2.calcOpticalFlowPyrLK(prev_gray, gray,
+                                                              prev_points, None,
+                                                              winSize=(15, 15),
+                                                              maxLevel=2)
+            good_new = next_points[status == 1]
+            good_old = prev_points[status == 1]
+
+            # Estimate average motion
+            dx = np.mean(good_new[:, 0] - good_old[:, 0])
+            dy = np.mean(good_new[:, 1] - good_old[:, 1])
+            x, y, w, h = bbox_before
+            x, y = int(x + dx), int(y + dy)
+            bbox_before = (x, y, w, h)
+            cv2.rectangle(frame_to_display, (x, y), (x + w, y + h), (0, 200, 255), 2)
+            tracking_data.append((current_frame_idx, x, y, w, h, "OpticalFlow"))
+
+            cv2.putText(frame_to_display, "OpticalFlow tracking", (20, 40),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
+
+            prev_gray = gray.copy()
+            prev_points = good_new.reshape(-1, 1, 2)
+
+    # ------------- Resume Post-Tracker after occlusion -------------
+    elif post_tracking_active and post_tracker is not None and bus_occlude_frame < current_frame_idx <= mc_leave_frame:
+        ok, r = post_tracker.update(frame_to_display)
+        if ok:
+            x, y, w, h = [int(v) for v in r]
+            cv2.rectangle(frame_to_display, (x, y), (x + w, y + h), (255, 0, 0), 2)
+            tracking_data.append((current_frame_idx, x, y, w, h, "CSRT-post"))
+            post_bbox = (x, y, w, h)
+
+        else:
+            cv2.putText(frame_to_display, "Post-tracker lost", (20, 70),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+
+    # ---------------- Checkpoints ----------------
+    if pre_tracking_active and current_frame_idx == bus_enter_frame:
+        take_checkpoint("flow-start")
+    elif pre_tracking_active and current_frame_idx == bus_occlude_frame:
+        take_checkpoint("flow-end")
+    elif (CHECKPOINT_INTERVAL and len(tracking_data) > tracked_before
+          and len(tracking_data) % CHECKPOINT_INTERVAL == 0):
+        take_checkpoint("interval")  # counts tracked frames; gap frames add no rows
+
+    # ---------------- Pause at before_frame or after_frame ----------------
+    if current_frame_idx >= before_frame and not pre_tracking_active and not post_tracking_active:
+        paused = True
+        scheduler.pause()
+        take_checkpoint("await-pre", awaiting="pre")
+        status_label.config(text=f"Paused at before_frame {before_frame}. Draw bbox and click 'Init Pre-Tracker'.")
+        show_frame(frame_to_display)
+        return
+
+    if current_frame_idx >= after_frame and pre_tracking_active and not post_tracking_active:
+        paused = True
+        scheduler.pause()
+        take_checkpoint("await-post", awaiting="post")
+        status_label.config(text=f"Paused at after_frame {after_frame}. Draw bbox and click 'Init Post-Tracker'.")
+        show_frame(frame_to_display)
+        return
+
+    if late:
+        return  # dropped from display to hold sync
+    show_frame(frame_to_display)
+    frame_label.config(text=f"Frame: {current_frame_idx}/{total_frames}")
+
+def show_frame(frame_bgr):
+    global panel, current_display_img
+    if not hasattr(root, 'winfo_exists') or not root.winfo_exists():
+        return  # Root window was closed, skip rendering
+
+    frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+    current_display_img = frame_rgb.copy()
+    try:
+        imgtk = ImageTk.PhotoImage(image=Image.fromarray(frame_rgb))
+        panel.imgtk = imgtk
+        panel.config(image=imgtk)
+    except Exception as e:
+        print("Skipped frame render (UI closed):", e)
+
+
+# -------------------- Mouse drawing --------------------
+def on_mouse_down(event):
+    global drawing, sx, sy, ex, ey
+    if not paused:
+        return
+    drawing = True
+    sx, sy = event.x, event.y
+    ex, ey = sx, sy
+
+def on_mouse_move(event):
+    global ex, ey
+    if not drawing:
+        return
+    ex, ey = event.x, event.y
+    temp = current_display_img.copy()
+    cv2.rectangle(temp, (sx, sy), (ex, ey), (255,0,0), 2)
+    imgtk = ImageTk.PhotoImage(image=Image.fromarray(temp))
+    panel.imgtk = imgtk
+    panel.config(image=imgtk)
+
+def on_mouse_up(event):
+    global drawing, bbox_before, bbox_after, sx, sy, ex, ey
+    if not paused:
+        return
+    drawing = False
+    ex, ey = event.x, event.y
+    x1, y1 = min(sx, ex), min(sy, ey)
+    x2, y2 = max(sx, ex), max(sy, ey)
+    w = max(1, x2 - x1)
+    h = max(1, y2 - y1)
+    if current_frame_idx >= before_frame and not pre_tracking_active:
+        bbox_before = (x1, y1, w, h)
+        status_label.config(text=f"Selected BEFORE bbox: {bbox_before}. Click 'Init Pre-Tracker'.")
+    elif current_frame_idx >= after_frame and pre_tracking_active and not post_tracking_active:
+        bbox_after = (x1, y1, w, h)
+        status_label.config(text=f"Selected AFTER bbox: {bbox_after}. Click 'Init Post-Tracker'.")
+
+# -------------------- Tracker init --------------------
+def init_pre_tracker():
+    global pre_tracker, pre_tracking_active, paused, playing
+    if current_frame_bgr is None or bbox_before is None:
+        messagebox.showwarning("Error","Draw bounding box first")
+        return
+    pre_tracker = cv2.TrackerCSRT_create()
+    pre_tracker.init(current_frame_bgr, bbox_before)
+    pre_tracking_active = True
+    paused = False
+    playing = True
+    take_checkpoint("pre-init")
+    status_label.config(text="Pre-tracker initialized. Resuming playback.")
+    resume_playback()
+
+def init_post_tracker():
+    global post_tracker, post_tracking_active, paused, playing, bbox_after, post_bbox
+
+    if current_frame_bgr is None:
+        messagebox.showwarning("Error", "No frame loaded to initialize tracker.")
+        return
+
+    # Validate bbox_after and fall back if missing
+    if bbox_after is None or not isinstance(bbox_after, (tuple, list)) or len(bbox_after) != 4:
+        messagebox.showwarning("Warning", "bbox_after missing or invalid. Using last known bbox_before.")
+        bbox_after = bbox_before
+    bbox_after = tuple(map(int, bbox_after))
+
+
+    post_tracker = cv2.TrackerCSRT_create()
+    try:
+        post_tracker.init(current_frame_bgr, bbox_after)
+    except Exception as e:
+        messagebox.showerror("Tracker Init Failed", f"Could not initialize post-tracker:\n{str(e)}")
+        return
+
+    post_tracking_active = True
+    post_bbox = bbox_after
+    paused = False
+    playing = True
+    take_checkpoint("post-init")
+    status_label.config(text="Post-tracker initialized. Resuming playback.")
+    resume_playback()
+
+# -------------------- Checkpoints --------------------
+def take_checkpoint(reason, awaiting=None):
+    """Save the session state after current_frame_idx. awaiting: 'pre'/'post' if paused for a bbox."""
+    if not video_path:
+        return
+    state = {
+        "video": os.path.basename(video_path),
+        "frame_idx": current_frame_idx,
+        "reason": reason,
+        "awaiting": awaiting,
+        "before_frame": before_frame,
+        "after_frame": after_frame,
+        "bus_enter_frame": bus_enter_frame,
+        "bus_occlude_frame": bus_occlude_frame,
+        "mc_leave_frame": mc_leave_frame,
+        "bbox_before": bbox_before,
+        "bbox_after": bbox_after,
+        "post_bbox": post_bbox,
+        "pre_tracking_active": pre_tracking_active,
+        "post_tracking_active": post_tracking_active,
+        "optical_flow_active": optical_flow_active,
+        "prev_points": prev_points,
+        "tracking_data": tracking_data,
+    }
+    try:
+        save_checkpoint(checkpoint_dir(video_path), state)
+    except OSError as e:
+        print("Checkpoint not saved:", e)
+
+def resume_checkpoint():
+    """Restore a checkpoint and continue playback right after its frame."""
+    global before_frame, after_frame, frames_set, current_frame_idx, current_frame_bgr
+    global bus_enter_frame, bus_occlude_frame, mc_leave_frame
+    global bbox_before, bbox_after, post_bbox
+    global pre_tracker, post_tracker, pre_tracking_active, post_tracking_active
+    global optical_flow_active, prev_gray, prev_points, paused, playing
+
+    if cap is None:
+        messagebox.showwarning("No video", "Please select a video first")
+        return
+    ckpt_dir = checkpoint_dir(video_path)
+    path = filedialog.askopenfilename(title="Select checkpoint",
+                                      initialdir=ckpt_dir if os.path.isdir(ckpt_dir) else ".",
+                                      filetypes=[("Checkpoint", "*.json")])
+    if not path:
+        return
+    try:
+        ckpt = load_checkpoint(path)
+    except (OSError, ValueError, KeyError) as e:
+        messagebox.showerror("Invalid checkpoint", str(e))
+        return
+    if ckpt["video"] != os.path.basename(video_path):
+        messagebox.showwarning("Warning", f"Checkpoint was taken on {ckpt['video']}, not the loaded video.")
+
+    # Seek straight to the checkpoint frame instead of replaying from 0
+    idx = ckpt["frame_idx"]
+    cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+    ret, frame = cap.read()
+    if not ret:
+        messagebox.showerror("Error", f"Cannot read frame {idx}")
+        return
+    stop_playback()
+
+    before_frame, after_frame = ckpt["before_frame"], ckpt["after_frame"]
+    bus_enter_frame, bus_occlude_frame = ckpt["bus_enter_frame"], ckpt["bus_occlude_frame"]
+    mc_leave_frame = ckpt["mc_leave_frame"]
+    bbox_before, bbox_after, post_bbox = ckpt["bbox_before"], ckpt["bbox_after"], ckpt["post_bbox"]
+    pre_tracking_active = ckpt["pre_tracking_active"]
+    post_tracking_active = ckpt["post_tracking_active"]
+    optical_flow_active = ckpt["optical_flow_active"]
+    prev_points = ckpt["prev_points"]
+    tracking_data[:] = ckpt["tracking_data"]
+    current_frame_idx = idx
+    current_frame_bgr = frame.copy()
+
+    # Re-initialize what cannot be serialized from the checkpoint frame
+    pre_tracker = post_tracker = None
+    if pre_tracking_active and idx < bus_enter_frame:
+        pre_tracker = cv2.TrackerCSRT_create()
+        pre_tracker.init(frame, bbox_before)
+    if optical_flow_active:
+        prev_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    if post_tracking_active:
+        post_tracker = cv2.TrackerCSRT_create()
+        post_tracker.init(frame, post_bbox)
+
+    frames_set = True
+    playing = True
+    paused = False
+    start_playback(process_frame, on_play_end, start_frame=idx + 1)
+    frame_label.config(text=f"Frame: {idx}/{total_frames}")
+    if ckpt["awaiting"]:
+        paused = True
+        scheduler.pause()
+        show_frame(frame)
+        button = "Init Pre-Tracker" if ckpt["awaiting"] == "pre" else "Init Post-Tracker"
+        status_label.config(text=f"Resumed at frame {idx}. Draw bbox and click '{button}'.")
+    else:
+        status_label.config(text=f"Resumed from checkpoint at frame {idx} ({ckpt['reason']}).")
+
+def restart():
+    stop_playback()
+    if video_path:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    for var in ['before_frame','after_frame','frames_set','paused','playing','current_frame_idx']:
+        globals()[var] = 0 if 'idx' in var else False
+    reset_session()
+    status_label.config(text="Reset. Re-enter frames and Set Frames to replay.")
+    frame_label.config(text=f"Frame: 0/{total_frames}")
+    clear_canvas()
+
+
+def save_tracking_csv():
+    global tracking_data, video_path
+    if not tracking_data:
+        messagebox.showwarning("No Data", "No tracking data to save.")
+        return
+    base = os.path.splitext(os.path.basename(video_path))[0]
+    csv_path = f"tracker_{base}.csv"
+    write_tracking_csv(tracking_data, csv_path)
+    messagebox.showinfo("Saved", f"Tracking data saved to {csv_path}")
+
+def replay_from_csv():
+    global cap, video_path
+    if not root.winfo_exists():
+        return
+    if not video_path:
+        messagebox.showwarning("Warning", "Load a video first.")
+        return
+
+    base = os.path.splitext(os.path.basename(video_path))[0]
+    csv_path = f"tracker_{base}.csv"
+    if not os.path.exists(csv_path):
+        messagebox.showwarning("Missing File", f"{csv_path} not found.")
+        return
+
+    frame_boxes = load_frame_boxes(csv_path)
+
+    def replay_frame(idx, frame, late):
+        if late:
+            return  # nothing to compute for a dropped frame
+        if idx in frame_boxes:
+            draw_box(frame, frame_boxes[idx])
+        try:
+            show_frame(frame)
+            frame_label.config(text=f"Frame: {idx}/{total_frames}")
+        except tk.TclError:
+            stop_playback()  # Window closed, stop replay
+
+    def replay_end(sched):
+        status_label.config(text=f"Replay complete ({sched.report()}).")
+        print("Replay:", sched.report())
+
+    status_label.config(text=f"Replaying from {csv_path}")
+    start_playback(replay_frame, replay_end)
+
+# -------------------- GUI layout --------------------
+def main():
+    global root, panel, entry_before, entry_after, status_label, frame_label
+
+    root = tk.Tk()
+    root.title("CCTV CSRT Tracker (Before/After Occlusion)")
+
+    panel = tk.Label(root)
+    panel.place(x=10, y=10)
+
+    ctrl_x = 1030  # temporary default width, will resize dynamically
+    tk.Label(root, text="Controls", font=("Helvetica", 12, "bold")).place(x=ctrl_x, y=10)
+
+    btn_open = tk.Button(root, text="Select Video", width=20, command=open_video)
+    btn_open.place(x=ctrl_x, y=45)
+
+    tk.Label(root, text="Before-occ stop frame:").place(x=ctrl_x, y=90)
+    entry_before = tk.Entry(root, width=10)
+    entry_before.place(x=ctrl_x+130, y=90)
+    entry_before.insert(0, "1")
+
+    tk.Label(root, text="After-occ stop frame:").place(x=ctrl_x, y=120)
+    entry_after = tk.Entry(root, width=10)
+    entry_after.place(x=ctrl_x+130, y=120)
+    entry_after.insert(0, "50")
+
+    btn_set = tk.Button(root, text="Set Frames & Play", width=20, command=set_frames)
+    btn_set.place(x=ctrl_x, y=155)
+
+    btn_init_pre = tk.Button(root, text="Init Pre-Tracker", width=20, command=init_pre_tracker)
+    btn_init_pre.place(x=ctrl_x, y=200)
+
+    btn_init_post = tk.Button(root, text="Init Post-Tracker", width=20, command=init_post_tracker)
+    btn_init_post.place(x=ctrl_x, y=235)
+
+    btn_restart = tk.Button(root, text="Restart", width=20, command=restart)
+    btn_restart.place(x=ctrl_x, y=270)
+
+    btn_save_csv = tk.Button(root, text="Save Tracking CSV", width=20, command=save_tracking_csv)
+    btn_save_csv.place(x=ctrl_x, y=305)
+
+    btn_replay_csv = tk.Button(root, text="Replay from CSV", width=20, command=replay_from_csv)
+    btn_replay_csv.place(x=ctrl_x, y=340)
+
+    btn_resume_ckpt = tk.Button(root, text="Resume Checkpoint", width=20, command=resume_checkpoint)
+    btn_resume_ckpt.place(x=ctrl_x, y=375)
+
+    status_label = tk.Label(root, text="Status: Idle", anchor="w", justify="left")
+    status_label.place(x=ctrl_x, y=410)
+
+    frame_label = tk.Label(root, text="Frame: 0/0")
+    frame_label.place(x=ctrl_x, y=435)
+
+
+    panel.bind("<Button-1>", on_mouse_down)
+    panel.bind("<B1-Motion>", on_mouse_move)
+    panel.bind("<ButtonRelease-1>", on_mouse_up)
+
+    reset_state()
+    root.mainloop()
@@ -0,0 +1,230 @@
+"""
+playback.py
+Non-blocking, drift-compensated playback for the Tkinter tracker GUI and the
+OpenCV-window CSV replay.
+
+FramePrefetcher decodes ahead on a background thread into a bounded queue.
+PlaybackScheduler pulls frames from it on an event loop with a Tk-style
+after()/after_cancel() API (the Tk root, or CvEventLoop for cv2 windows), and
+times each frame against a monotonic clock instead of a fixed delay, so the
+time spent decoding, tracking and drawing does not add up to drift. Frames
+that are already more than one period late are handed to the callback with
+late=True so it can skip drawing/displaying them and playback holds sync. At
+most max_catchup frames are skipped in a row, and a backlog beyond that is
+dropped from the clock, so playback that cannot keep up still shows frames.
+"""
+
+import heapq
+import itertools
+import queue
+import threading
+import time
+
+import cv2
+
+
+class FramePrefetcher:
+    """Decode frames from start_frame on a daemon thread. Yields (idx, frame), then None at the end."""
+
+    def __init__(self, video_path, start_frame=0, maxsize=32):
+        self.cap = cv2.VideoCapture(video_path)
+        if start_frame:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        self.start_frame = start_frame
+        self.queue = queue.Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        idx = self.start_frame
+        while not self._stop.is_set():
+            ret, frame = self.cap.read()
+            item = (idx, frame) if ret else None
+            while not self._stop.is_set():
+                try:
+                    self.queue.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            if item is None:
+                break
+            idx += 1
+        self.cap.release()
+
+    def get_nowait(self):
+        return self.queue.get_nowait()
+
+    def stop(self):
+        self._stop.set()
+        self.thread.join(timeout=1.0)
+
+
+class CvEventLoop:
+    """Minimal after()/after_cancel() event loop for cv2.imshow windows.
+    Idle time is spent in cv2.waitKey so the window stays responsive."""
+
+    def __init__(self, quit_keys=(27, ord("q"))):
+        self._queue = []
+        self._ids = itertools.count()
+        self._cancelled = set()
+        self.quit_keys = quit_keys
+        self.quit = False
+
+    def after(self, ms, callback):
+        job = next(self._ids)
+        heapq.heappush(self._queue, (time.monotonic() + ms / 1000.0, job, callback))
+        return job
+
+    def after_cancel(self, job):
+        self._cancelled.add(job)
+
+    def mainloop(self):
+        while self._queue and not self.quit:
+            due, job, callback = heapq.heappop(self._queue)
+            if job in self._cancelled:
+                self._cancelled.discard(job)
+                continue
+            wait_ms = max(1, int((due - time.monotonic()) * 1000))
+            if (cv2.waitKey(wait_ms) & 0xFF) in self.quit_keys:
+                self.quit = True
+                break
+            callback()
+
+
+class PlaybackScheduler:
+    """Drive on_frame(idx, frame, late) at the target fps from the Tk event loop.
+
+    on_frame may call pause()/stop(). on_end(scheduler) is called when the video
+    runs out. late frames should be processed if needed (e.g. tracker updates)
+    but not displayed.
+    """
+
+    def __init__(self, root, video_path, on_frame, fps=None, start_frame=0, on_end=None,
+                 drop_late=True, prefetch=32, max_catchup=8):
+        if not fps:
+            cap = cv2.VideoCapture(video_path)
+            fps = cap.get(cv2.CAP_PROP_FPS) or 24
+            cap.release()
+        self.root = root
+        self.on_frame = on_frame
+        self.on_end = on_end
+        self.target_fps = max(1.0, float(fps))
+        self.period = 1.0 / self.target_fps
+        self.drop_late = drop_late
+        self.max_catchup = max_catchup  # late frames handled per tick before yielding to Tk
+        self.prefetcher = FramePrefetcher(video_path, start_frame, maxsize=prefetch)
+
+        self.paused = False
+        self.stopped = False
+        self._job = None
+        self._t0 = None
+        self._n = 0
+        self._play_started = None
+
+        self.frames = 0        # frames handed to on_frame
+        self.dropped = 0       # of which late (not displayed)
+        self.play_seconds = 0.0
+
+    # ---------- control ----------
+    def start(self):
+        self._anchor()
+        self._schedule(0.0)
+        return self
+
+    def pause(self):
+        if self.paused or self.stopped:
+            return
+        self.paused = True
+        self._accumulate()
+        self._cancel()
+
+    def resume(self):
+        if not self.paused or self.stopped:
+            return
+        self.paused = False
+        self._anchor()  # re-anchor the clock so the pause is not "caught up"
+        self._schedule(0.0)
+
+    def stop(self):
+        if self.stopped:
+            return
+        if not self.paused:
+            self._accumulate()
+        self.stopped = True
+        self._cancel()
+        self.prefetcher.stop()
+
+    # ---------- stats ----------
+    @property
+    def achieved_fps(self):
+        """Displayed frames per second of playback (late frames do not count)."""
+        seconds = self.play_seconds
+        if self._play_started is not None:
+            seconds += time.monotonic() - self._play_started
+        return (self.frames - self.dropped) / seconds if seconds > 0 else 0.0
+
+    def report(self):
+        return (f"{self.achieved_fps:.1f}/{self.target_fps:.1f} fps, "
+                f"{self.dropped} late frames not displayed")
+
+    # ---------- internals ----------
+    def _anchor(self):
+        self._t0 = time.monotonic()
+        self._n = 0
+        self._play_started = self._t0
+
+    def _accumulate(self):
+        if self._play_started is not None:
+            self.play_seconds += time.monotonic() - self._play_started
+            self._play_started = None
+
+    def _schedule(self, delay):
+        self._job = self.root.after(max(0, int(delay * 1000)), self._tick)
+
+    def _cancel(self):
+        if self._job is not None:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass  # root already destroyed
+            self._job = None
+
+    def _tick(self):
+        self._job = None
+        if self.paused or self.stopped:
+            return
+        handled = 0
+        while True:
+            try:
+                item = self.prefetcher.get_nowait()
+            except queue.Empty:
+                self._schedule(0.002)  # decoder fell behind; poll again shortly
+                return
+            if item is None:
+                self.stop()
+                if self.on_end is not None:
+                    self.on_end(self)
+                return
+
+            idx, frame = item
+            lag = time.monotonic() - (self._t0 + self._n * self.period)
+            if lag > self.max_catchup * self.period:
+                # Too far behind to catch up (work per frame exceeds the period):
+                # move the clock instead, so the deadlines do not slip forever
+                self._t0 += lag
+                lag = 0.0
+            self._n += 1
+            handled += 1
+            # The last frame of a catch-up burst is always shown so the display never freezes
+            late = self.drop_late and lag > self.period and handled < self.max_catchup
+            self.frames += 1
+            if late:
+                self.dropped += 1
+            self.on_frame(idx, frame, late)
+            if self.paused or self.stopped:
+                return
+            if not late:
+                break
+
+        self._schedule(self._t0 + self._n * self.period - time.monotonic())
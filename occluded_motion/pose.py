@@ -0,0 +1,214 @@
+"""
+pose.py
+MediaPipe pose extraction, keyframe selection for confidence-driven sparse
+inference, and linear interpolation of the gaps.
+
+mediapipe is imported only when a Pose object is created. Drawing uses the
+hard-coded POSE_CONNECTIONS, so rendering never needs mediapipe.
+
+Stages 3 and 4 interpolate landmarks between known frames anyway, so MediaPipe
+only needs to run on keyframes: frames where the bbox has moved or changed size
+noticeably since the last inferred frame, or where the last inference had low
+landmark visibility. Frames in between are filled by the existing linear
+interpolation.
+"""
+
+import cv2
+import numpy as np
+
+from .annotations import make_annotations
+
+
+class KeyframeSelector:
+    """Decide, per frame with a bbox, whether pose inference must run.
+
+    quality in [0, 1] trades accuracy for throughput:
+      1.0 -> every frame is a keyframe (same as dense inference)
+      0.0 -> loosest thresholds, longest allowed gap between keyframes
+    """
+
+    def __init__(self, motion_thresh, scale_thresh, min_visibility, max_gap, segment_bounds=()):
+        self.motion_thresh = motion_thresh    # center shift, as a fraction of bbox diagonal
+        self.scale_thresh = scale_thresh      # relative change of bbox area
+        self.min_visibility = min_visibility  # mean landmark visibility below this forces a keyframe
+        self.max_gap = max_gap                # max frames between two keyframes
+        # First and last frame of every bbox run: always inferred so interpolation
+        # across a bbox gap (e.g. the occlusion) is anchored on both sides
+        self.segment_bounds = frozenset(segment_bounds)
+
+        self.last_idx = None
+        self.last_bbox = None
+        self.last_visibility = None
+        self.total = 0
+        self.inferred = 0
+
+    @classmethod
+    def from_quality(cls, quality, segment_bounds=()):
+        q = float(np.clip(quality, 0.0, 1.0))
+        slack = 1.0 - q
+        return cls(motion_thresh=0.25 * slack,
+                   scale_thresh=0.30 * slack,
+                   min_visibility=0.5 + 0.3 * q,
+                   max_gap=1 + int(round(14 * slack)),
+                   segment_bounds=segment_bounds)
+
+    def is_keyframe(self, idx, bbox):
+        """Return True if MediaPipe should run on frame idx. Call once per bbox frame."""
+        self.total += 1
+        if self._needs_inference(idx, bbox):
+            self.inferred += 1
+            return True
+        return False
+
+    def _needs_inference(self, idx, bbox):
+        if self.last_idx is None or idx in self.segment_bounds:
+            return True
+        if idx - self.last_idx >= self.max_gap:
+            return True
+        # Last inference failed or was unsure -> keep inferring until it recovers
+        if self.last_visibility is None or self.last_visibility < self.min_visibility:
+            return True
+
+        x0, y0, w0, h0 = self.last_bbox
+        x1, y1, w1, h1 = bbox
+        diag = max(1.0, float(np.hypot(w0, h0)))
+        shift = np.hypot((x1 + w1 / 2) - (x0 + w0 / 2), (y1 + h1 / 2) - (y0 + h0 / 2))
+        if shift / diag > self.motion_thresh:
+            return True
+
+        area0 = max(1.0, float(w0 * h0))
+        if abs(w1 * h1 - area0) / area0 > self.scale_thresh:
+            return True
+        return False
+
+    def update(self, idx, bbox, visibility):
+        """Record the result of an inference run (visibility is None if no pose was found)."""
+        self.last_idx = idx
+        self.last_bbox = tuple(float(v) for v in bbox)
+        self.last_visibility = visibility
+
+    @property
+    def skipped_fraction(self):
+        if self.total == 0:
+            return 0.0
+        return 1.0 - self.inferred / self.total
+
+    def summary(self):
+        skipped = self.total - self.inferred
+        return (f"Sparse pose: inferred {self.inferred}/{self.total} frames, "
+                f"skipped {skipped} ({self.skipped_fraction:.1%})")
+
+
+# -------------------- MediaPipe --------------------
+# BlazePose skeleton edges over the 33 landmarks (= mp.solutions.pose.POSE_CONNECTIONS)
+POSE_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 7), (0, 4), (4, 5), (5, 6), (6, 8), (9, 10),
+    (11, 12), (11, 13), (13, 15), (15, 17), (15, 19), (15, 21), (17, 19),
+    (12, 14), (14, 16), (16, 18), (16, 20), (16, 22), (18, 20),
+    (11, 23), (12, 24), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28),
+    (27, 29), (28, 30), (29, 31), (30, 32), (27, 31), (28, 32),
+)
+
+
+def create_pose():
+    """Same MediaPipe settings as the original stages 3 and 4."""
+    import mediapipe as mp
+    return mp.solutions.pose.Pose(static_image_mode=False, model_complexity=1, enable_segmentation=False)
+
+
+def get_pose_keypoints(pose, frame, bbox):
+    """Crop frame by bbox and run pose detection.
+    Returns (keypoints in original frame scale, mean visibility), or (None, None)."""
+    x, y, w, h = map(int, bbox)
+    cropped = frame[y:y+h, x:x+w]
+    if cropped.size == 0:
+        return None, None
+
+    rgb = cv2.cvtColor(cropped, cv2.COLOR_BGR2RGB)
+    result = pose.process(rgb)
+    if not result.pose_landmarks:
+        return None, None
+
+    landmarks = result.pose_landmarks.landmark
+    keypoints = np.array([[x + lm.x * w, y + lm.y * h] for lm in landmarks])
+    return keypoints, float(np.mean([lm.visibility for lm in landmarks]))
+
+
+def segment_bounds(bbox_dict):
+    """First and last frame of each run of consecutive bbox frames."""
+    return {idx for idx in bbox_dict if idx - 1 not in bbox_dict or idx + 1 not in bbox_dict}
+
+
+def estimate_poses(video_path, bbox_dict, pose, sparse=False, quality=0.7):
+    """Run pose on bbox frames (keyframes only when sparse). Returns (poses, selector)."""
+    poses = {}
+    if not bbox_dict:
+        return poses, None
+    last = max(bbox_dict)
+    selector = KeyframeSelector.from_quality(quality, segment_bounds(bbox_dict)) if sparse else None
+
+    cap = cv2.VideoCapture(video_path)
+    for idx in range(last + 1):
+        # grab() advances without converting the frame; only retrieve frames we infer on
+        if not cap.grab():
+            break
+        if idx not in bbox_dict:
+            continue
+        bbox = bbox_dict[idx]
+        if selector is not None and not selector.is_keyframe(idx, bbox):
+            continue  # filled by interpolation
+        ret, frame = cap.retrieve()
+        if not ret:
+            break
+        joints, visibility = get_pose_keypoints(pose, frame, bbox)
+        if selector is not None:
+            selector.update(idx, bbox, visibility)
+        if joints is not None:
+            poses[idx] = joints
+    cap.release()
+    return poses, selector
+
+
+def interpolate_poses(poses, bbox_dict, bboxes=True):
+    """Linear interpolation of poses (and, with bboxes, bboxes) between known pose frames.
+    Tracked bboxes are kept; only frames without one get an interpolated bbox.
+    bboxes=False keeps only the tracked bboxes, like stage 3."""
+    predicted_poses = poses.copy()
+    predicted_bboxes = bbox_dict.copy()
+
+    known_frames = sorted(poses.keys())
+    for f1, f2 in zip(known_frames, known_frames[1:]):
+        gap = f2 - f1 - 1
+        if gap <= 0:
+            continue
+        k1, k2 = poses[f1], poses[f2]
+        b1, b2 = np.array(predicted_bboxes[f1]), np.array(predicted_bboxes[f2])
+        pose_velocity = (k2 - k1) / (gap + 1)
+        bbox_velocity = (b2 - b1) / (gap + 1)
+        for j in range(1, gap + 1):
+            predicted_poses[f1 + j] = k1 + pose_velocity * j
+            if bboxes and f1 + j not in bbox_dict:
+                predicted_bboxes[f1 + j] = tuple((b1 + bbox_velocity * j).tolist())
+    return predicted_poses, predicted_bboxes
+
+
+def draw_pose(frame, keypoints):
+    """Draw pose skeleton given 2D keypoints."""
+    for i, j in POSE_CONNECTIONS:
+        if i < len(keypoints) and j < len(keypoints):
+            p1, p2 = keypoints[i], keypoints[j]
+            cv2.line(frame, tuple(map(int, p1)), tuple(map(int, p2)), (0, 255, 0), 2)
+    for p in keypoints:
+        cv2.circle(frame, tuple(map(int, p)), 3, (0, 0, 255), -1)
+
+
+def reconstruct(video_path, bbox_dict, pose, sparse=False, quality=0.7, occluded_frames=(),
+                interpolate_bboxes=True):
+    """Pose extraction + interpolation for one tracked video.
+    interpolate_bboxes=False gives stage 3's output (tracked bboxes only), True stage 4's.
+    Returns (annotations, selector); selector is None in dense mode."""
+    poses, selector = estimate_poses(video_path, bbox_dict, pose, sparse=sparse, quality=quality)
+    predicted_poses, predicted_bboxes = interpolate_poses(poses, bbox_dict, bboxes=interpolate_bboxes)
+    annotations = make_annotations(predicted_bboxes, predicted_poses,
+                                   inferred_frames=poses.keys(), occluded_frames=occluded_frames)
+    return annotations, selector
@@ -0,0 +1,323 @@
+"""
+render.py
+Rendering of the annotation stream onto the source video (stages 3/4 output).
+
+Renders, on request, either one annotated frame or a full annotated video from
+the source video plus its annotations. For full videos, runs of frames that
+need no overlay are stream-copied from the source with ffmpeg instead of being
+decoded and re-encoded; only the GOPs with overlays are encoded, with the
+source's own x264 settings. Without ffmpeg/ffprobe on PATH, with
+--no-passthrough, or when the source's settings cannot be reproduced, the whole
+video is re-encoded with cv2.VideoWriter like stages 3/4.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+
+import cv2
+
+from .pose import draw_pose
+from .video import video_info
+
+
+def needs_overlay(annotations, frame_idx, background=None):
+    ann = annotations.get(frame_idx)
+    if ann is None:
+        return False
+    if background is not None and ann["occluded"]:
+        return True
+    return ann["bbox"] is not None or ann["keypoints"] is not None
+
+
+def annotate_frame(frame, ann, background=None):
+    """Draw one frame's annotation (in place unless the frame is inpainted)."""
+    if background is not None and ann["occluded"]:
+        frame = background.copy()
+    if ann["bbox"] is not None:
+        x, y, w, h = map(int, ann["bbox"])
+        cv2.rectangle(frame, (x, y), (x + w, y + h), (255, 0, 0), 2)
+    if ann["keypoints"] is not None:
+        draw_pose(frame, ann["keypoints"])
+    return frame
+
+
+def load_background(background_path, width, height):
+    if not background_path:
+        return None
+    background = cv2.imread(background_path)
+    if background is None:
+        raise IOError(f"Cannot read background {background_path}")
+    return cv2.resize(background, (width, height))
+
+
+def render_frame(video_path, annotations, frame_idx, background=None):
+    """Seek to one frame and return it annotated."""
+    cap = cv2.VideoCapture(video_path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+    ret, frame = cap.read()
+    cap.release()
+    if not ret:
+        raise IndexError(f"Frame {frame_idx} not found in {video_path}")
+    ann = annotations.get(frame_idx)
+    if ann is None:
+        return frame
+    return annotate_frame(frame, ann, background)
+
+
+def render_video_full(video_path, annotations, output_path, background=None):
+    """Decode + re-encode every frame (the stage 3/4 way)."""
+    info = video_info(video_path)
+    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+    out = cv2.VideoWriter(output_path, fourcc, info["fps"], (info["width"], info["height"]))
+    cap = cv2.VideoCapture(video_path)
+    frame_idx = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if frame_idx in annotations:
+            frame = annotate_frame(frame, annotations[frame_idx], background)
+        out.write(frame)
+        frame_idx += 1
+    cap.release()
+    out.release()
+    return {"encoded_frames": frame_idx, "copied_frames": 0}
+
+
+# -------------------- ffmpeg passthrough --------------------
+# Copied and encoded parts are joined with the concat demuxer and `-c copy`, and
+# MP4 keeps one sample description (SPS/PPS) for the whole track. So encoded
+# parts must reproduce the source's parameter sets exactly. For x264 sources the
+# encoder settings are recovered from the x264 SEI and the resulting extradata
+# is compared with the source; any other source, or any mismatch, falls back to
+# one full re-encode.
+
+# x264 SEI option -> x264-params key, copied verbatim
+X264_OPTIONS = {
+    "cabac": "cabac", "ref": "ref", "8x8dct": "8x8dct", "bframes": "bframes", "b_adapt": "b-adapt",
+    "weightb": "weightb", "weightp": "weightp", "keyint": "keyint", "keyint_min": "keyint-min",
+    "scenecut": "scenecut", "open_gop": "open-gop", "constrained_intra": "constrained-intra",
+    "interlaced": "interlaced", "bluray_compat": "bluray-compat", "direct": "direct",
+    "subme": "subme", "me": "me", "me_range": "me-range", "trellis": "trellis", "psy": "psy",
+    "mixed_ref": "mixed-refs", "chroma_me": "chroma-me", "fast_pskip": "fast-pskip",
+    "decimate": "decimate", "nr": "nr", "rc_lookahead": "rc-lookahead", "mbtree": "mbtree",
+    "crf": "crf", "qcomp": "qcomp", "qpmin": "qpmin", "qpmax": "qpmax", "qpstep": "qpstep",
+    "ip_ratio": "ipratio", "pb_ratio": "pbratio", "slices": "slices",
+}
+B_PYRAMID = {"0": "none", "1": "strict", "2": "normal"}
+
+
+def ffmpeg_available():
+    return shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
+
+
+def _ffprobe_json(video_path, *args):
+    out = subprocess.run(["ffprobe", "-v", "error", "-select_streams", "v:0", *args, "-of", "json", video_path],
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+def _extradata(video_path):
+    """Hex of the first video stream's codec extradata (avcC with SPS/PPS for H.264)."""
+    out = subprocess.run(["ffprobe", "-v", "error", "-select_streams", "v:0", "-show_streams", "-show_data",
+                          video_path], check=True, capture_output=True, text=True).stdout
+    if "extradata=" not in out:
+        return ""
+    dump = out.split("extradata=", 1)[1].split("extradata_size", 1)[0]
+    # hexdump lines: "00000000: 0164 001e ...  .d.."
+    return "".join(line[10:49].replace(" ", "") for line in dump.strip().splitlines())
+
+
+def _packets(video_path):
+    """Video packets in presentation order, i.e. indexed like decoded frames."""
+    packets = _ffprobe_json(video_path, "-show_entries", "packet=pts,pts_time,flags,data_hash",
+                            "-show_data_hash", "MD5")["packets"]
+    return sorted((p for p in packets if p.get("pts") is not None), key=lambda p: int(p["pts"]))
+
+
+def _probe(video_path):
+    """Stream parameters, keyframe frame indices and per-frame packet hashes.
+    Frame indices come from the packets' presentation order, not pts_time * fps,
+    so start_time offsets and B-frame reordering do not shift them."""
+    stream = _ffprobe_json(video_path, "-show_entries",
+                           "stream=codec_name,pix_fmt,time_base,r_frame_rate")["streams"][0]
+    packets = _packets(video_path)
+    keyframes = {idx: float(p["pts_time"]) for idx, p in enumerate(packets) if "K" in p.get("flags", "")}
+    return {"codec": stream["codec_name"], "pix_fmt": stream.get("pix_fmt", "yuv420p"),
+            "time_base": stream["time_base"], "frame_rate": stream["r_frame_rate"],
+            "frames": len(packets), "keyframes": keyframes, "hashes": [p["data_hash"] for p in packets],
+            "extradata": _extradata(video_path)}
+
+
+def _x264_options(video_path):
+    """Options from the x264 SEI of the first packet, or None if not x264."""
+    raw = subprocess.run(["ffmpeg", "-v", "error", "-i", video_path, "-map", "0:v:0", "-c:v", "copy",
+                          "-frames:v", "1", "-bsf:v", "h264_mp4toannexb", "-f", "h264", "-"],
+                         capture_output=True).stdout
+    match = re.search(rb"x264 - core \d+.*? options: ([^\x00]*)", raw)
+    if match is None:
+        return None
+    return dict(kv.split("=", 1) for kv in match.group(1).decode("latin-1").split() if "=" in kv)
+
+
+def x264_params(options):
+    """x264-params string reproducing the SPS/PPS of a stream encoded with `options`."""
+    params = {X264_OPTIONS[k]: v for k, v in options.items() if k in X264_OPTIONS}
+    if "b_pyramid" in options:
+        params["b-pyramid"] = B_PYRAMID.get(options["b_pyramid"], options["b_pyramid"])
+    if "deblock" in options:
+        enabled, alpha, beta = options["deblock"].split(":")
+        if enabled == "1":
+            params["deblock"] = f"{alpha},{beta}"
+        else:
+            params["no-deblock"] = "1"
+    if "aq" in options:
+        mode, *strength = options["aq"].split(":")
+        params["aq-mode"] = mode
+        if strength:
+            params["aq-strength"] = strength[0]
+    psy_rd, psy_trellis = (float(v) for v in options.get("psy_rd", "0:0").split(":"))
+    if options.get("psy") == "1":
+        params["psy-rd"] = f"{psy_rd},{psy_trellis}"
+    if "chroma_qp_offset" in options:
+        # The SEI records the offset after x264 lowered it for psy-rd/psy-trellis; undo that
+        offset = int(options["chroma_qp_offset"])
+        if options.get("psy") == "1":
+            if int(options.get("subme", 0)) >= 6 and psy_rd > 0:
+                offset += 1 if psy_rd < 0.25 else 2
+            if int(options.get("trellis", 0)) > 0 and psy_trellis > 0:
+                offset += 1 if psy_trellis < 0.25 else 2
+        params["chroma-qp-offset"] = str(offset)
+    return ":".join(f"{k}={v}" for k, v in params.items())
+
+
+def _encoder_args(video_path, probe):
+    """ffmpeg output args that reproduce the source's parameter sets, or None."""
+    if probe["codec"] != "h264":
+        return None
+    options = _x264_options(video_path)
+    if options is None:
+        return None
+    return ["-c:v", "libx264", "-x264-params", x264_params(options)]
+
+
+def plan_segments(overlay_frames, keyframes, total):
+    """Split [0, total) into ("encode"|"copy", start, end) runs (end exclusive).
+    Encoded runs are widened to keyframe boundaries so every copied run starts
+    on a keyframe and can be stream-copied exactly."""
+    keyframes = sorted(set(k for k in keyframes if 0 <= k < total) | {0})
+    runs = []
+    for idx in sorted(overlay_frames):
+        start = max(k for k in keyframes if k <= idx)
+        end = min([k for k in keyframes if k > idx] or [total])
+        if runs and start <= runs[-1][1]:
+            runs[-1][1] = max(runs[-1][1], end)
+        else:
+            runs.append([start, end])
+
+    segments = []
+    pos = 0
+    for start, end in runs:
+        if start > pos:
+            segments.append(("copy", pos, start))
+        segments.append(("encode", start, end))
+        pos = end
+    if pos < total:
+        segments.append(("copy", pos, total))
+    return segments
+
+
+def _encode_segment(video_path, annotations, background, start, end, info, probe, encoder_args, path):
+    timescale = probe["time_base"].split("/")[1]
+    cmd = ["ffmpeg", "-v", "error", "-y", "-f", "rawvideo", "-pix_fmt", "bgr24",
+           "-s", f"{info['width']}x{info['height']}", "-r", probe["frame_rate"], "-i", "-",
+           "-an", *encoder_args, "-pix_fmt", probe["pix_fmt"], "-video_track_timescale", timescale, path]
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    cap = cv2.VideoCapture(video_path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    for idx in range(start, end):
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if idx in annotations:
+            frame = annotate_frame(frame, annotations[idx], background)
+        proc.stdin.write(frame.tobytes())
+    cap.release()
+    proc.stdin.close()
+    if proc.wait() != 0:
+        raise RuntimeError(f"ffmpeg failed encoding frames {start}-{end}")
+
+
+def _copy_segment(video_path, start, end, probe, path):
+    # Seek to the keyframe's own pts (-seek_timestamp: not offset by start_time);
+    # input seeking with -c copy starts there exactly
+    subprocess.run(["ffmpeg", "-v", "error", "-y", "-seek_timestamp", "1",
+                    "-ss", f"{probe['keyframes'][start]:.6f}", "-i", video_path,
+                    "-map", "0:v:0", "-frames:v", str(end - start), "-an", "-c:v", "copy", path], check=True)
+
+
+def _verify(output_path, probe, segments):
+    """Same frame count and parameter sets as the source, and every copied frame
+    byte-identical to the source frame with the same index."""
+    if _extradata(output_path) != probe["extradata"]:
+        return False
+    hashes = [p["data_hash"] for p in _packets(output_path)]
+    if len(hashes) != probe["frames"]:
+        return False
+    return all(hashes[start:end] == probe["hashes"][start:end]
+               for kind, start, end in segments if kind == "copy")
+
+
+def render_video_passthrough(video_path, annotations, output_path, background=None):
+    """Stream-copy the GOPs without overlay, re-encode the rest with the source's
+    encoder settings. Falls back to render_video_full when that cannot be done
+    exactly; the output always has the source's frame count."""
+    info = video_info(video_path)
+    probe = _probe(video_path)
+    total = probe["frames"]
+    overlay = [i for i in annotations if i < total and needs_overlay(annotations, i, background)]
+    if not overlay:
+        shutil.copyfile(video_path, output_path)
+        return {"encoded_frames": 0, "copied_frames": total}
+
+    encoder_args = _encoder_args(video_path, probe)
+    if encoder_args is None:
+        return render_video_full(video_path, annotations, output_path, background)
+    segments = plan_segments(overlay, probe["keyframes"], total)
+
+    stats = {"encoded_frames": 0, "copied_frames": 0}
+    with tempfile.TemporaryDirectory() as tmp:
+        parts = []
+        for n, (kind, start, end) in enumerate(segments):
+            part = os.path.join(tmp, f"part_{n:04d}.mp4")
+            if kind == "copy":
+                _copy_segment(video_path, start, end, probe, part)
+                stats["copied_frames"] += end - start
+            else:
+                _encode_segment(video_path, annotations, background, start, end, info, probe,
+                                encoder_args, part)
+                if _extradata(part) != probe["extradata"]:
+                    return render_video_full(video_path, annotations, output_path, background)
+                stats["encoded_frames"] += end - start
+            parts.append(part)
+        list_path = os.path.join(tmp, "parts.txt")
+        with open(list_path, "w") as f:
+            f.writelines(f"file '{p}'\n" for p in parts)
+        # auto_convert 0: all parts share the source's avcC, so packets are joined
+        # verbatim instead of getting in-band SPS/PPS inserted
+        subprocess.run(["ffmpeg", "-v", "error", "-y", "-f", "concat", "-safe", "0", "-auto_convert", "0",
+                        "-i", list_path, "-c", "copy", output_path], check=True)
+    if not _verify(output_path, probe, segments):
+        return render_video_full(video_path, annotations, output_path, background)
+    return stats
+
+
+def render_video(video_path, annotations, output_path, background=None, passthrough=True):
+    """Render an annotated video; passthrough stream-copies segments without overlay."""
+    if passthrough and ffmpeg_available():
+        return render_video_passthrough(video_path, annotations, output_path, background)
+    return render_video_full(video_path, annotations, output_path, background)
@@ -0,0 +1,55 @@
+"""
+replay.py
+Replay a tracker CSV over its video in an OpenCV window.
+
+Same drawing as the GUI's "Replay from CSV", but without Tkinter/PIL, so it
+starts quickly from the command line. Press q or Esc to stop.
+"""
+
+import csv
+
+import cv2
+
+from .playback import CvEventLoop, PlaybackScheduler
+
+METHOD_COLORS = {"pre": (0, 255, 0), "Optical": (0, 200, 255)}
+DEFAULT_COLOR = (255, 0, 0)
+
+
+def load_frame_boxes(csv_path):
+    """{frame_idx: (x, y, w, h, method)} from a tracker CSV."""
+    frame_boxes = {}
+    with open(csv_path, "r") as f:
+        for row in csv.DictReader(f):
+            frame_boxes[int(row["frame_idx"])] = (
+                int(row["x"]), int(row["y"]), int(row["w"]), int(row["h"]), row["method"]
+            )
+    return frame_boxes
+
+
+def draw_box(frame, box):
+    x, y, w, h, method = box
+    color = next((c for key, c in METHOD_COLORS.items() if key in method), DEFAULT_COLOR)
+    cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
+    cv2.putText(frame, method, (x, y - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+
+
+def replay(video_path, csv_path, window="Replay from CSV"):
+    """Play video_path with the CSV boxes drawn. Returns the scheduler report."""
+    frame_boxes = load_frame_boxes(csv_path)
+    loop = CvEventLoop()
+
+    def on_frame(idx, frame, late):
+        if late:
+            return
+        if idx in frame_boxes:
+            draw_box(frame, frame_boxes[idx])
+        cv2.imshow(window, frame)
+
+    scheduler = PlaybackScheduler(loop, video_path, on_frame).start()
+    try:
+        loop.mainloop()
+    finally:
+        scheduler.stop()
+        cv2.destroyWindow(window)
+    return scheduler.report()
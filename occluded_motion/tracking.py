@@ -0,0 +1,239 @@
+"""
+tracking.py
+Headless person tracking (stage 2 without the GUI).
+
+CSRT before and after the occlusion, Lucas-Kanade optical flow during it. The
+config holds what the GUI collects interactively (see TRACKING_CONFIG_KEYS).
+"""
+
+import csv
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from .video import open_at
+
+TRACKING_CONFIG_KEYS = ("before_frame", "bbox_before", "after_frame", "bbox_after",
+                        "bus_enter_frame", "bus_occlude_frame", "mc_leave_frame")
+
+# Backward flow is checked point by point: a point is kept only if tracking it
+# back again lands within FB_MAX_ERROR px of where it started, and the estimate
+# is dropped once fewer than MIN_FLOW_POINTS survive (e.g. the points moved
+# onto the occluder).
+FB_MAX_ERROR = 1.0
+MIN_FLOW_POINTS = 5
+LK_PARAMS = dict(winSize=(15, 15), maxLevel=2)
+
+
+def _flow_step(prev_gray, gray, prev_points, bbox, max_fb_error=None):
+    """One Lucas-Kanade step: shift bbox by the mean motion of the tracked points.
+    With max_fb_error, points failing the forward-backward check are discarded."""
+    next_points, status, _ = cv2.calcOpticalFlowPyrLK(prev_gray, gray, prev_points, None, **LK_PARAMS)
+    good = status.ravel() == 1
+    if max_fb_error is not None:
+        back_points, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, prev_gray, next_points, None,
+                                                               **LK_PARAMS)
+        fb_error = np.linalg.norm((back_points - prev_points).reshape(-1, 2), axis=1)
+        good &= (back_status.ravel() == 1) & (fb_error < max_fb_error)
+    good_new = next_points.reshape(-1, 2)[good]
+    good_old = prev_points.reshape(-1, 2)[good]
+    if len(good_new) == 0:
+        return bbox, None
+    dx = np.mean(good_new[:, 0] - good_old[:, 0])
+    dy = np.mean(good_new[:, 1] - good_old[:, 1])
+    x, y, w, h = bbox
+    return (int(x + dx), int(y + dy), w, h), good_new.reshape(-1, 1, 2)
+
+
+def _flow_points(gray, bbox):
+    x, y, w, h = bbox
+    points = cv2.goodFeaturesToTrack(gray[y:y+h, x:x+w], maxCorners=50,
+                                     qualityLevel=0.3, minDistance=5)
+    if points is not None:
+        points[:, 0, 0] += x
+        points[:, 0, 1] += y
+    return points
+
+
+def _track_pre(video_path, before_frame, bbox_before, bus_enter_frame, bus_occlude_frame):
+    """CSRT-pre from before_frame, then forward optical flow through the occlusion.
+    Returns (CSRT-pre rows, {frame_idx: bbox} forward flow estimates)."""
+    rows, flow = [], {}
+    cap = open_at(video_path, before_frame)
+    ret, frame = cap.read()
+    if not ret:
+        cap.release()
+        return rows, flow
+    tracker = cv2.TrackerCSRT_create()
+    tracker.init(frame, bbox_before)
+    prev_gray = prev_points = None
+
+    for idx in range(before_frame + 1, bus_occlude_frame + 1):
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if idx < bus_enter_frame:
+            ok, r = tracker.update(frame)
+            if ok:
+                bbox_before = tuple(int(v) for v in r)
+                rows.append((idx, *bbox_before, "CSRT-pre"))
+            continue
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if prev_gray is None:
+            prev_gray = gray
+            prev_points = _flow_points(gray, bbox_before)
+        if prev_points is not None:
+            bbox_before, prev_points = _flow_step(prev_gray, gray, prev_points, bbox_before)
+            flow[idx] = bbox_before
+        prev_gray = gray
+    cap.release()
+    return rows, flow
+
+
+def _track_post(video_path, after_frame, bbox_after, bus_occlude_frame, mc_leave_frame):
+    """CSRT-post from after_frame to mc_leave_frame. As in the GUI, the tracker is
+    only updated after bus_occlude_frame."""
+    rows = []
+    cap = open_at(video_path, after_frame)
+    ret, frame = cap.read()
+    if not ret:
+        cap.release()
+        return rows
+    tracker = cv2.TrackerCSRT_create()
+    tracker.init(frame, bbox_after)
+    for idx in range(after_frame + 1, mc_leave_frame + 1):
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if idx <= bus_occlude_frame:
+            continue
+        ok, r = tracker.update(frame)
+        if ok:
+            rows.append((idx, *(int(v) for v in r), "CSRT-post"))
+    cap.release()
+    return rows
+
+
+def _flow_backward(video_path, after_frame, bbox_after, bus_enter_frame, bus_occlude_frame):
+    """Optical flow run backward in time from bbox_after at after_frame.
+    Returns {frame_idx: bbox} for frames inside the occlusion; empty or cut short
+    where the forward-backward check leaves fewer than MIN_FLOW_POINTS points."""
+    cap = open_at(video_path, bus_enter_frame)
+    grays = []
+    for _ in range(bus_enter_frame, after_frame + 1):
+        ret, frame = cap.read()
+        if not ret:
+            break
+        grays.append(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+    cap.release()
+    if len(grays) != after_frame - bus_enter_frame + 1:
+        return {}
+
+    flow = {}
+    bbox = bbox_after
+    prev_gray = grays[-1]
+    prev_points = _flow_points(prev_gray, bbox)
+    for idx in range(after_frame - 1, bus_enter_frame - 1, -1):
+        if prev_points is None or len(prev_points) < MIN_FLOW_POINTS:
+            break
+        gray = grays[idx - bus_enter_frame]
+        bbox, prev_points = _flow_step(prev_gray, gray, prev_points, bbox, max_fb_error=FB_MAX_ERROR)
+        if prev_points is None or len(prev_points) < MIN_FLOW_POINTS:
+            break
+        if idx <= bus_occlude_frame:
+            flow[idx] = bbox
+        prev_gray = gray
+    return flow
+
+
+def fuse_flow(forward, backward, forward_anchor, backward_anchor):
+    """Blend forward and backward flow estimates, each weighted by its distance to
+    its own anchor: the last CSRT-pre frame and after_frame. Returns OpticalFlow rows."""
+    rows = []
+    span = max(1, backward_anchor - forward_anchor)
+    for idx in sorted(set(forward) | set(backward)):
+        if idx in forward and idx in backward:
+            w = (idx - forward_anchor) / span  # 0 -> forward only, 1 -> backward only
+            bbox = (1 - w) * np.array(forward[idx]) + w * np.array(backward[idx])
+            bbox = tuple(int(round(v)) for v in bbox)
+        else:
+            bbox = forward.get(idx, backward.get(idx))
+        rows.append((idx, *bbox, "OpticalFlow"))
+    return rows
+
+
+def track_video(video_path, cfg, concurrent=True, bidirectional=True):
+    """Run the stage-2 tracking logic without the GUI.
+
+    cfg holds the values the GUI collects interactively (see TRACKING_CONFIG_KEYS):
+    the bboxes drawn at before_frame / after_frame and the three phase boundaries.
+    Returns tracking_data rows (frame_idx, x, y, w, h, method) like the GUI.
+
+    Once both bboxes are known, the pre segment (CSRT-pre + forward flow) and the
+    post segment (CSRT-post) are independent. With concurrent=True they run on
+    separate threads, each seeking to its own start frame (OpenCV releases the
+    GIL while decoding and tracking). With bidirectional=True the occlusion is
+    also bridged by flow running backward from bbox_after, fused with the
+    forward estimate.
+    """
+    missing = [k for k in TRACKING_CONFIG_KEYS if k not in cfg]
+    if missing:
+        raise ValueError(f"Tracking config missing {missing}")
+    before_frame, after_frame = int(cfg["before_frame"]), int(cfg["after_frame"])
+    bus_enter_frame = int(cfg["bus_enter_frame"])
+    bus_occlude_frame = int(cfg["bus_occlude_frame"])
+    mc_leave_frame = int(cfg["mc_leave_frame"])
+    bbox_before = tuple(int(v) for v in cfg["bbox_before"])
+    bbox_after = tuple(int(v) for v in cfg["bbox_after"])
+
+    jobs = {
+        "pre": (_track_pre, (video_path, before_frame, bbox_before, bus_enter_frame, bus_occlude_frame)),
+        "post": (_track_post, (video_path, after_frame, bbox_after, bus_occlude_frame, mc_leave_frame)),
+    }
+    if bidirectional and bus_enter_frame < after_frame:
+        jobs["backward"] = (_flow_backward,
+                            (video_path, after_frame, bbox_after, bus_enter_frame, bus_occlude_frame))
+
+    if concurrent:
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            futures = {name: pool.submit(fn, *args) for name, (fn, args) in jobs.items()}
+            results = {name: f.result() for name, f in futures.items()}
+    else:
+        results = {name: fn(*args) for name, (fn, args) in jobs.items()}
+
+    pre_rows, forward = results["pre"]
+    backward = results.get("backward", {})
+    forward_anchor = pre_rows[-1][0] if pre_rows else before_frame
+    flow_rows = fuse_flow(forward, backward, forward_anchor, after_frame)
+    return sorted(pre_rows + flow_rows + results["post"], key=lambda row: row[0])
+
+
+def save_tracking_csv(tracking_data, csv_path):
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["frame_idx", "x", "y", "w", "h", "method"])
+        writer.writerows(tracking_data)
+
+
+def occlusion_gap(frames):
+    """Longest run of untracked frames between two tracked frames, as a range
+    (empty if there is none). On the sample clip: 48..75, between the last
+    OpticalFlow row and the first CSRT-post row."""
+    frames = sorted(frames)
+    gap = range(0)
+    for prev, nxt in zip(frames, frames[1:]):
+        if nxt - prev - 1 > len(gap):
+            gap = range(prev + 1, nxt)
+    return gap
+
+
+def load_tracking_csv(csv_path):
+    """Return ({frame_idx: (x, y, w, h)}, {frame_idx: method}) from a tracker CSV."""
+    bbox_dict, methods = {}, {}
+    with open(csv_path, "r") as f:
+        for row in csv.DictReader(f):
+            idx = int(row["frame_idx"])
+            bbox_dict[idx] = (float(row["x"]), float(row["y"]), float(row["w"]), float(row["h"]))
+            methods[idx] = row["method"]
+    return bbox_dict, methods
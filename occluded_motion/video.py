@@ -0,0 +1,28 @@
+"""
+video.py
+Small OpenCV video helpers shared by the pipeline stages.
+"""
+
+import cv2
+
+
+def video_info(video_path):
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video {video_path}")
+    info = {
+        "fps": cap.get(cv2.CAP_PROP_FPS) or 24,
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "frame_count": int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+    }
+    cap.release()
+    return info
+
+
+def open_at(video_path, start_frame=0):
+    """VideoCapture positioned so the next read() returns start_frame."""
+    cap = cv2.VideoCapture(video_path)
+    if start_frame:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+    return cap
@@ -0,0 +1,21 @@
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_VIDEO = os.path.join(ROOT, "road_dataset2.mp4")
+SAMPLE_TRACKER_CSV = os.path.join(ROOT, "tracker_road_dataset2.csv")
+
+# Values of the sample clip's tracker CSV (see the README workflow)
+SAMPLE_CONFIG = {
+    "before_frame": 1, "bbox_before": [421, 162, 43, 131],
+    "after_frame": 75, "bbox_after": [307, 165, 68, 177],
+    "bus_enter_frame": 40, "bus_occlude_frame": 47, "mc_leave_frame": 144,
+}
+
+
+@pytest.fixture
+def sample_video():
+    if not os.path.exists(SAMPLE_VIDEO):
+        pytest.skip("sample clip road_dataset2.mp4 not available")
+    return SAMPLE_VIDEO
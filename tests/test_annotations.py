@@ -0,0 +1,18 @@
+import numpy as np
+
+from occluded_motion.annotations import load_annotations, make_annotations, write_annotations
+
+
+def test_occluded_frames_without_bbox_or_pose_are_kept(tmp_path):
+    bboxes = {10: (1, 2, 3, 4), 13: (5, 6, 7, 8)}
+    poses = {10: np.zeros((33, 2))}
+    annotations = make_annotations(bboxes, poses, inferred_frames=[10], occluded_frames=range(11, 13))
+    assert sorted(annotations) == [10, 11, 12, 13]
+    assert annotations[11] == {"bbox": None, "keypoints": None, "occluded": True, "pose_predicted": False}
+    assert not annotations[13]["occluded"]
+
+    path = tmp_path / "annotations.csv"
+    assert write_annotations(path, annotations) == 4
+    loaded = load_annotations(path)
+    assert loaded[12] == annotations[12]
+    assert loaded[10]["keypoints"].shape == (33, 2)
@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+pytest.importorskip("cv2")
+
+from occluded_motion.batch import build_summary, job_dir, load_jobs  # noqa: E402
+
+
+def _write_manifest(tmp_path, entries):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(entries))
+    return str(path)
+
+
+def test_same_basename_gets_distinct_ids(tmp_path):
+    source = _write_manifest(tmp_path, [{"video": "a/clip.mp4"}, {"video": "b/clip.mp4"}])
+    jobs = load_jobs(source)
+    assert [job["id"] for job in jobs] == ["a/clip", "b/clip"]
+    assert job_dir("out", jobs[0]["id"]) != job_dir("out", jobs[1]["id"])
+
+
+def test_explicit_id_and_duplicates(tmp_path):
+    source = _write_manifest(tmp_path, [{"video": "a/clip.mp4", "id": "first"}, {"video": "b/clip.mp4"}])
+    assert [job["id"] for job in load_jobs(source)] == ["first", "b/clip"]
+
+    source = _write_manifest(tmp_path, [{"video": "a.mp4", "id": "x"}, {"video": "b.mp4", "id": "x"}])
+    with pytest.raises(ValueError):
+        load_jobs(source)
+
+
+def test_directory_ids_are_basenames(tmp_path):
+    (tmp_path / "clip01.mp4").write_bytes(b"")
+    assert [job["id"] for job in load_jobs(str(tmp_path))] == ["clip01"]
+
+
+def test_summary_throughput_excludes_resumed():
+    resumed = [{"id": f"old{i}", "status": "ok", "frames": 100, "timings": {"total": 10.0}} for i in range(50)]
+    summary = build_summary([], 0.5, workers=2, resumed=resumed)
+    assert summary["videos_per_second"] == 0.0
+    assert summary["resumed"] == 50 and summary["stage_seconds"] == {}
+
+    records = [{"id": "new", "status": "ok", "frames": 100, "timings": {"total": 2.0}}]
+    summary = build_summary(records, 2.0, workers=2, resumed=resumed)
+    assert summary["ok"] == 1 and summary["videos_per_second"] == 0.5
+    assert summary["frames_processed"] == 100 and summary["stage_seconds"] == {"total": 2.0}
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from occluded_motion.checkpoint import load_checkpoint, save_checkpoint
+
+
+def _state(prev_points):
+    return {
+        "video": "clip.mp4", "frame_idx": np.int64(42), "reason": "interval", "awaiting": None,
+        "before_frame": 1, "after_frame": np.int32(75),
+        "bus_enter_frame": 40, "bus_occlude_frame": 47, "mc_leave_frame": 144,
+        "bbox_before": (np.int64(421), 162, 43, 131), "bbox_after": None, "post_bbox": [307, 165, 68, 177],
+        "pre_tracking_active": True, "post_tracking_active": np.bool_(False),
+        "optical_flow_active": True, "prev_points": prev_points,
+        "tracking_data": [(41, np.int64(420), 160, 43, 131, "OpticalFlow"),
+                          (42, 419, np.float32(161.0), 43, 131, "OpticalFlow")],
+    }
+
+
+def test_round_trip(tmp_path):
+    points = np.array([[[1.5, 2.25]], [[3.0, 4.0]]], dtype=np.float32)
+    path = save_checkpoint(tmp_path, _state(points))
+    assert path.endswith("frame_00042_interval.json")
+
+    state = load_checkpoint(path)
+    assert state["frame_idx"] == 42 and state["after_frame"] == 75
+    assert state["post_tracking_active"] is False
+    assert state["bbox_before"] == (421, 162, 43, 131)
+    assert state["bbox_after"] is None
+    assert state["post_bbox"] == (307, 165, 68, 177)
+    assert state["tracking_data"] == [(41, 420, 160, 43, 131, "OpticalFlow"),
+                                      (42, 419, 161.0, 43, 131, "OpticalFlow")]
+    assert state["prev_points"].dtype == np.float32
+    np.testing.assert_array_equal(state["prev_points"], points)
+
+
+@pytest.mark.parametrize("points", [None, np.empty((0, 1, 2), dtype=np.float32)])
+def test_round_trip_without_flow_points(tmp_path, points):
+    state = load_checkpoint(save_checkpoint(tmp_path, _state(points)))
+    if points is None:
+        assert state["prev_points"] is None
+    else:
+        assert state["prev_points"].shape == (0, 1, 2)
@@ -0,0 +1,96 @@
+import heapq
+import itertools
+import time
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from occluded_motion import playback  # noqa: E402
+from occluded_motion.playback import PlaybackScheduler  # noqa: E402
+
+N_FRAMES = 145
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeLoop:
+    """after()/after_cancel() on a simulated clock: run() jumps to each callback's due time."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self._queue = []
+        self._ids = itertools.count()
+        self._cancelled = set()
+
+    def after(self, ms, callback):
+        job = next(self._ids)
+        heapq.heappush(self._queue, (self.clock.now + ms / 1000.0, job, callback))
+        return job
+
+    def after_cancel(self, job):
+        self._cancelled.add(job)
+
+    def run(self):
+        while self._queue:
+            due, job, callback = heapq.heappop(self._queue)
+            if job in self._cancelled:
+                continue
+            self.clock.now = max(self.clock.now, due)
+            callback()
+
+
+@pytest.fixture
+def clip(tmp_path):
+    path = tmp_path / "clip.avi"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 24, (64, 48))
+    for i in range(N_FRAMES):
+        writer.write(np.full((48, 64, 3), i % 256, dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+def _play(clip, monkeypatch, work_seconds, fps=24):
+    clock = FakeClock()
+    monkeypatch.setattr(playback, "time", clock)
+    loop = FakeLoop(clock)
+    displayed, handled = [], []
+
+    def on_frame(idx, frame, late):
+        clock.now += work_seconds  # tracking runs for every frame, late or not
+        handled.append(idx)
+        if not late:
+            displayed.append(idx)
+
+    scheduler = PlaybackScheduler(loop, clip, on_frame, fps=fps, prefetch=N_FRAMES + 1)
+    # Let the decoder finish so the simulated clock never waits on it
+    deadline = time.monotonic() + 10
+    while scheduler.prefetcher.queue.qsize() < N_FRAMES + 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    scheduler.start()
+    loop.run()
+    return scheduler, displayed, handled
+
+
+def test_fast_frames_are_all_displayed(clip, monkeypatch):
+    scheduler, displayed, handled = _play(clip, monkeypatch, work_seconds=0.005)
+    assert handled == displayed == list(range(N_FRAMES))
+    assert scheduler.dropped == 0
+    assert scheduler.achieved_fps == pytest.approx(24, rel=0.05)
+
+
+def test_slow_frames_keep_the_display_moving(clip, monkeypatch):
+    # 60 ms of work per frame at 24 fps (41.7 ms period) can never catch up
+    scheduler, displayed, handled = _play(clip, monkeypatch, work_seconds=0.060)
+    assert handled == list(range(N_FRAMES))
+    assert displayed[-1] >= N_FRAMES - scheduler.max_catchup
+    assert max(np.diff(displayed)) <= scheduler.max_catchup
+    assert scheduler.dropped == N_FRAMES - len(displayed)
+    assert scheduler.achieved_fps == pytest.approx(len(displayed) / scheduler.play_seconds)
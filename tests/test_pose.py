@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+
+from occluded_motion.pose import KeyframeSelector, interpolate_poses, segment_bounds  # noqa: E402
+
+
+def _select(bbox_dict, quality=0.0):
+    selector = KeyframeSelector.from_quality(quality, segment_bounds(bbox_dict))
+    keyframes = []
+    for idx in sorted(bbox_dict):
+        if selector.is_keyframe(idx, bbox_dict[idx]):
+            keyframes.append(idx)
+            selector.update(idx, bbox_dict[idx], visibility=1.0)
+    return keyframes
+
+
+def test_segment_bounds():
+    bbox_dict = dict.fromkeys([2, 3, 4, 10, 11, 20], (0, 0, 10, 10))
+    assert segment_bounds(bbox_dict) == {2, 4, 10, 11, 20}
+
+
+def test_keyframes_anchor_both_sides_of_bbox_gap():
+    # Static bbox: without forced bounds only max_gap would trigger inference
+    bbox_dict = {idx: (100, 100, 40, 120) for idx in list(range(2, 45)) + list(range(76, 145))}
+    keyframes = _select(bbox_dict)
+    assert {2, 44, 76, 144} <= set(keyframes)
+    assert len(keyframes) < len(bbox_dict)
+
+
+def test_full_quality_is_dense():
+    bbox_dict = {idx: (100, 100, 40, 120) for idx in range(30)}
+    assert _select(bbox_dict, quality=1.0) == list(range(30))
+
+
+def test_interpolation_across_gap_uses_segment_ends():
+    bbox_dict = {idx: (float(idx), 0.0, 10.0, 10.0) for idx in list(range(0, 5)) + list(range(9, 12))}
+    poses = {4: np.zeros((33, 2)), 9: np.full((33, 2), 5.0)}
+    predicted_poses, predicted_bboxes = interpolate_poses(poses, bbox_dict)
+    assert np.allclose(predicted_poses[6], 2.0)
+    assert predicted_bboxes[6] == (6.0, 0.0, 10.0, 10.0)
+
+
+def test_pose_connections_table():
+    from occluded_motion.pose import POSE_CONNECTIONS
+
+    assert len(POSE_CONNECTIONS) == len(set(POSE_CONNECTIONS)) == 35
+    assert all(0 <= i < 33 and 0 <= j < 33 for i, j in POSE_CONNECTIONS)
+    try:
+        from mediapipe.python.solutions.pose import POSE_CONNECTIONS as mp_connections
+    except ImportError:
+        return
+    assert set(POSE_CONNECTIONS) == set(mp_connections)
+
+
+def test_stage3_keeps_tracked_bboxes_only():
+    bbox_dict = {0: (0.0, 0.0, 10.0, 10.0), 4: (4.0, 0.0, 10.0, 10.0)}
+    poses = {0: np.zeros((33, 2)), 4: np.full((33, 2), 4.0)}
+    predicted_poses, predicted_bboxes = interpolate_poses(poses, bbox_dict, bboxes=False)
+    assert sorted(predicted_poses) == [0, 1, 2, 3, 4]
+    assert predicted_bboxes == bbox_dict
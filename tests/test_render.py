@@ -0,0 +1,102 @@
+import shutil
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from conftest import ROOT
+
+cv2 = pytest.importorskip("cv2")
+
+from occluded_motion.render import (_probe, plan_segments, render_frame, render_video,  # noqa: E402
+                                    x264_params)
+
+needs_ffmpeg = pytest.mark.skipif(not (shutil.which("ffmpeg") and shutil.which("ffprobe")),
+                                  reason="ffmpeg/ffprobe not on PATH")
+
+
+def _annotations(frames):
+    rng = np.random.default_rng(0)
+    return {idx: {"bbox": (300.0, 160.0, 60.0, 170.0),
+                  "keypoints": np.column_stack([rng.uniform(300, 360, 33), rng.uniform(160, 330, 33)]),
+                  "occluded": False, "pose_predicted": False}
+            for idx in frames}
+
+
+def _frames(path):
+    cap = cv2.VideoCapture(str(path))
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def test_plan_segments_widens_to_keyframes():
+    assert plan_segments([30, 31, 100], [0, 24, 48, 96, 120], 145) == [
+        ("copy", 0, 24), ("encode", 24, 48), ("copy", 48, 96), ("encode", 96, 120), ("copy", 120, 145)]
+    assert plan_segments([5], [0], 10) == [("encode", 0, 10)]
+
+
+def test_x264_params_undo_psy_chroma_offset():
+    options = {"psy": "1", "psy_rd": "1.00:0.00", "subme": "7", "trellis": "1",
+               "chroma_qp_offset": "-2", "deblock": "1:0:0", "b_pyramid": "2", "ref": "3"}
+    params = dict(kv.split("=") for kv in x264_params(options).split(":"))
+    assert params["chroma-qp-offset"] == "0"
+    assert params["deblock"] == "0,0" and params["b-pyramid"] == "normal" and params["ref"] == "3"
+
+
+def test_drawing_does_not_import_mediapipe(sample_video):
+    code = ("import sys\n"
+            "import numpy as np\n"
+            "from occluded_motion.render import render_frame\n"
+            "ann = {'bbox': (300, 160, 60, 170), 'keypoints': np.full((33, 2), 320.0),\n"
+            "       'occluded': False, 'pose_predicted': False}\n"
+            f"render_frame({sample_video!r}, {{10: ann}}, 10)\n"
+            "print('mediapipe' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_render_frame_draws_overlay(sample_video):
+    plain = render_frame(sample_video, {}, 10)
+    drawn = render_frame(sample_video, _annotations([10]), 10)
+    assert plain.shape == drawn.shape and not np.array_equal(plain, drawn)
+
+
+@needs_ffmpeg
+def test_passthrough_round_trip_sample_clip(sample_video, tmp_path):
+    out = tmp_path / "out.mp4"
+    render_video(sample_video, _annotations(range(80, 91)), str(out))
+    assert len(_frames(out)) == len(_frames(sample_video))
+    subprocess.run(["ffmpeg", "-v", "error", "-xerror", "-i", str(out), "-f", "null", "-"], check=True)
+
+
+@needs_ffmpeg
+def test_passthrough_copies_gops_exactly(sample_video, tmp_path):
+    # Multi-GOP x264 source with a start_time offset
+    source = tmp_path / "gop.mp4"
+    subprocess.run(["ffmpeg", "-v", "error", "-i", sample_video, "-an", "-c:v", "libx264", "-g", "24",
+                    "-preset", "veryfast", "-output_ts_offset", "1.5", str(source)], check=True)
+    keyframes = sorted(_probe(str(source))["keyframes"])
+    assert keyframes[:3] == [0, 24, 48]
+
+    annotations = _annotations(list(range(10, 15)) + list(range(80, 85)))
+    out = tmp_path / "out.mp4"
+    stats = render_video(str(source), annotations, str(out))
+    assert stats["copied_frames"] > 0 and stats["encoded_frames"] > 0
+
+    src, rendered = _frames(source), _frames(out)
+    assert len(rendered) == len(src)
+    segments = plan_segments(annotations, keyframes, len(src))
+    for kind, start, end in segments:
+        for idx in range(start, end):
+            if kind == "copy":
+                assert np.array_equal(rendered[idx], src[idx])
+            else:
+                expected = render_frame(str(source), annotations, idx)
+                assert cv2.PSNR(expected, rendered[idx]) > 25  # lossy, but the right frame
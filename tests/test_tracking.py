@@ -0,0 +1,92 @@
+import os
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from occluded_motion.tracking import (  # noqa: E402
+    _flow_backward, fuse_flow, load_tracking_csv, occlusion_gap, track_video)
+
+from conftest import SAMPLE_CONFIG, SAMPLE_TRACKER_CSV  # noqa: E402
+
+
+def _moving_patch_video(path, n_frames=20, step=3, size=(320, 240)):
+    """Static noise background with a textured patch moving right by step px/frame."""
+    rng = np.random.default_rng(0)
+    w, h = size
+    background = cv2.GaussianBlur(rng.integers(0, 255, (h, w), dtype=np.uint8), (5, 5), 0)
+    patch = cv2.GaussianBlur(rng.integers(0, 255, (60, 40), dtype=np.uint8), (3, 3), 0)
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 25, size)
+    for i in range(n_frames):
+        frame = background.copy()
+        x = 40 + step * i
+        frame[90:150, x:x + 40] = patch
+        writer.write(cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR))
+    writer.release()
+
+
+def test_fuse_flow_weights_by_distance_to_own_anchor():
+    forward = {idx: (0, 0, 10, 10) for idx in range(40, 48)}
+    backward = {idx: (100, 0, 10, 10) for idx in range(40, 48)}
+    rows = {row[0]: row[1] for row in fuse_flow(forward, backward, forward_anchor=39, backward_anchor=75)}
+    # At bus_occlude_frame the backward anchor is still 28 frames away
+    assert rows[47] == round(100 * 8 / 36)
+    assert rows[40] < rows[47] < 50
+
+
+def test_fuse_flow_uses_single_estimate():
+    rows = fuse_flow({40: (1, 2, 3, 4)}, {41: (5, 6, 7, 8)}, 39, 42)
+    assert rows == [(40, 1, 2, 3, 4, "OpticalFlow"), (41, 5, 6, 7, 8, "OpticalFlow")]
+
+
+def test_occlusion_gap_is_the_untracked_run():
+    assert occlusion_gap([1, 2, 3, 7, 8, 10]) == range(4, 7)
+    assert occlusion_gap([3, 1, 2]) == range(0)
+    assert occlusion_gap([]) == range(0)
+
+
+def test_occlusion_gap_on_sample_tracker_csv():
+    if not os.path.exists(SAMPLE_TRACKER_CSV):
+        pytest.skip("sample tracker CSV not available")
+    bbox_dict, _ = load_tracking_csv(SAMPLE_TRACKER_CSV)
+    assert occlusion_gap(bbox_dict) == range(48, 76)
+
+
+def test_backward_flow_follows_consistent_motion(tmp_path):
+    video = tmp_path / "patch.avi"
+    _moving_patch_video(video)
+    flow = _flow_backward(str(video), 19, (40 + 3 * 19, 90, 40, 60), 5, 12)
+    assert sorted(flow) == list(range(5, 13))
+    for idx, (x, y, w, h) in flow.items():
+        assert abs(x - (40 + 3 * idx)) <= 2 and abs(y - 90) <= 2
+
+
+def test_backward_flow_stops_before_the_occlusion_on_sample_clip(sample_video):
+    cfg = SAMPLE_CONFIG
+    args = (sample_video, cfg["after_frame"], tuple(cfg["bbox_after"]), cfg["bus_enter_frame"])
+    # The points are dragged onto the passing bus and fail the forward-backward
+    # check at frame 71, long before the flow frames (up to bus_occlude_frame)
+    assert _flow_backward(*args, cfg["bus_occlude_frame"]) == {}
+    assert sorted(_flow_backward(*args, cfg["after_frame"] - 1)) == [72, 73, 74]
+
+
+def test_bidirectional_fuses_backward_flow_on_moving_patch(tmp_path):
+    video = str(tmp_path / "patch.avi")
+    _moving_patch_video(video)
+    cfg = {"before_frame": 0, "bbox_before": [40, 90, 40, 60],
+           "after_frame": 19, "bbox_after": [40 + 3 * 19, 90, 40, 60],
+           "bus_enter_frame": 6, "bus_occlude_frame": 12, "mc_leave_frame": 19}
+    rows = track_video(video, cfg)
+    forward_only = track_video(video, cfg, concurrent=False, bidirectional=False)
+    backward = _flow_backward(video, 19, tuple(cfg["bbox_after"]), 6, 12)
+    assert sorted(backward) == list(range(6, 13))
+
+    forward = {r[0]: r[1:5] for r in forward_only if r[5] == "OpticalFlow"}
+    forward_anchor = max(r[0] for r in rows if r[5] == "CSRT-pre")
+    assert [r for r in rows if r[5] == "OpticalFlow"] == fuse_flow(forward, backward, forward_anchor, 19)
+    # The backward estimate pulls the lagging forward flow towards the patch
+    fused = {r[0]: r[1] for r in rows}
+    for idx in range(7, 13):
+        assert abs(fused[idx] - (40 + 3 * idx)) <= abs(forward[idx][0] - (40 + 3 * idx))
+    assert abs(fused[12] - 76) < abs(forward[12][0] - 76)